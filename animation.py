@@ -0,0 +1,125 @@
+"""
+Class Animation used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.tools import StopWatch
+
+from hub_display import SCROLL_PERIOD
+from hub_input import PRESS
+from scheduler import Scheduler
+
+# Time in ms between two checks of an animation, the duration of a frame is rounded up to it
+ANIMATION_PERIOD = 20
+
+
+class Animation:
+    """ Plays a sequence of frames on the color matrix without blocking. A frame is a tuple (picture, color,
+        duration): the coordinates of a pixel graphic, e.g. from the PixelLibrary, or None for a dark display, the
+        palette index of its color and the time in ms it is shown. Each frame is drawn into the framebuffer and
+        pushed in one commit, modules looking the same as in the frame before are not written again.
+
+        task() plays the animation as a task of a Scheduler, play() runs it on its own until it is over or a
+        button of the hub is pressed.
+
+        Input needed:
+        - matrix: driver of the display (MatrixHelper in buffered mode)
+        - frames (tuple): frames of the animation
+        - loop (boolean): if True the animation starts again after the last frame, until it is stopped
+        - offset (tuple): x and y position of the pictures' origin on the display, e.g. to center them
+
+        Readable from outside:
+        - done (boolean): True when the animation is over or stopped
+        - interrupted (boolean): True if play() was ended by a button
+    """
+
+    def __init__(self, matrix, frames, loop=False, offset=(0, 0)):
+        self.__matrix = matrix
+        self.__frames = frames
+        self.__loop = loop
+        self.__offset = offset
+        self.done = False
+        self.interrupted = False
+
+    def stop(self):
+        """Ends the animation after the frame shown at the moment."""
+        self.done = True
+
+    def __draw(self, frame):
+        self.__matrix.clear()
+        if frame[0] is not None:
+            self.__matrix.blit_points(frame[0], frame[1], self.__offset[0], self.__offset[1])
+        self.__matrix.commit()
+
+    def task(self):
+        """ Generator task for the Scheduler, add it with ANIMATION_PERIOD as period. Shows every frame for its
+        duration; afterwards done is True and the task does nothing anymore.
+        :return:
+        """
+        clock = StopWatch()
+        self.done = False
+        index = 0
+        end = 0
+        while not self.done:
+            self.__draw(self.__frames[index])
+            end += self.__frames[index][2]
+            while not self.done and clock.time() < end:
+                yield
+            index += 1
+            if index == len(self.__frames):
+                if not self.__loop:
+                    self.done = True
+                index = 0
+        while True:
+            yield
+
+    def __watch(self, hub_input):
+        """Task stopping the animation as soon as a button of the hub is pressed."""
+        while True:
+            event = hub_input.next_event(0)
+            if event is not None and event[0] == PRESS:
+                self.interrupted = True
+                self.stop()
+            yield
+
+    def __follow(self, display):
+        """Task keeping the text on the hub's display scrolling, a looped animation ends with the text."""
+        while True:
+            display.update()
+            if self.__loop and not display.scrolling():
+                self.stop()
+            yield
+
+    def play(self, hub_input=None, display=None):
+        """ Plays the animation and returns when it is over. A looped animation is over when the text scrolling on
+        the hub's display has ended.
+        :param hub_input: events of the hub's buttons (HubInput), a pressed button ends the animation; None plays
+                          it to the end
+        :param display: hub's display (HubDisplay) with a text started by scroll(), it keeps scrolling meanwhile
+        :return: True if the animation was ended by a button
+        """
+        self.interrupted = False
+        tasks = Scheduler(name="animation")
+        tasks.add(self.task(), ANIMATION_PERIOD)
+        if hub_input is not None:
+            hub_input.clear()
+            tasks.add(self.__watch(hub_input), ANIMATION_PERIOD)
+        if display is not None:
+            tasks.add(self.__follow(display), SCROLL_PERIOD)
+        tasks.run(lambda: self.done)
+        return self.interrupted
@@ -0,0 +1,81 @@
+"""
+Class ArcadeServices used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.hubs import PrimeHub
+from pybricks.pupdevices import ForceSensor
+
+from detect_devices import DetectDevices
+from game_input import GameInput
+from hub_display import HubDisplay
+from hub_input import HubInput
+from input_log import InputLog
+from matrix_helper import MatrixHelper
+from pixel_library import PixelLibrary, PIC_RES_X, PIC_RES_Y
+
+# Resolution of the display in pixel, both must be multiples of 3. Every 3x3 block needs one ColorLightMatrix.
+DISPLAY_RESOLUTION = (6, 6)
+
+
+class ArcadeServices:
+    """ Holds the hardware and the helpers shared by the main menu, GameControl and the games. It is created once
+        per boot and handed to everyone who needs it, so the ports are scanned only once and every device is
+        opened only once.
+
+        Readable from outside:
+        - resolution (tuple): x and y resolution of the display in pixel
+        - hub: the LEGO Spike Prime Hub
+        - display: the hub's 5x5 display, writes only changes and scrolls text without blocking (HubDisplay)
+        - hub_input: events of the hub's buttons (HubInput)
+        - devices: result of the port scan (DetectDevices)
+        - matrix: driver of the display (MatrixHelper in buffered mode, drawing needs a commit)
+        - pixel_lib: library of pixel graphics (PixelLibrary)
+        - pic_offset (tuple): x and y position of a pixel graphic centered on the display
+        - button_L, button_R: LEGO Spike Prime Force Sensors used as left and right game controller, the first two
+          found in the port scan; all other ports are free for matrix modules
+        - game_input: per tick snapshot of both game controllers (GameInput)
+        - input_log: recording and replay of game rounds (InputLog), switched on in input_log.py
+    """
+
+    def __init__(self, display_res_x, display_res_y):
+        self.resolution = (display_res_x, display_res_y)
+
+        self.hub = PrimeHub()  # initialize LEGO Spike Prime Hub
+        self.display = HubDisplay(self.hub.display)  # skip unchanged writes to the hub's display
+        self.hub_input = HubInput(self.hub)  # sample the hub's buttons as events
+        self.devices = DetectDevices()  # scan the ports once for the whole session
+        self.matrix = MatrixHelper(display_res_x, display_res_y, buffered=True, devices=self.devices)
+        self.pixel_lib = PixelLibrary()  # initialize pixel drawings library
+
+        # Pixel graphics are centered on displays bigger than the graphics
+        self.pic_offset = ((display_res_x - PIC_RES_X) // 2, (display_res_y - PIC_RES_Y) // 2)
+
+        # Check if two Force Sensors are available as game controllers
+        try:
+            if len(self.devices.force_sensor_ports) < 2:
+                print("\n"
+                      "Two Spike Force Sensors are needed as game controllers, found",
+                      len(self.devices.force_sensor_ports), "\n")
+                raise Exception
+        except Exception:
+            raise
+        self.button_L = ForceSensor(self.devices.force_sensor_ports[0])  # Force Sensor as left button
+        self.button_R = ForceSensor(self.devices.force_sensor_ports[1])  # Force Sensor as right button
+        self.input_log = InputLog()  # records or replays game rounds if switched on
+        self.game_input = GameInput(self.button_L, self.button_R, log=self.input_log)  # read controllers per tick
@@ -18,12 +18,12 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 
 """
 
-from pybricks.hubs import PrimeHub
-from pybricks.pupdevices import ForceSensor
-from pybricks.parameters import Port, Color
-from pybricks.tools import wait as blocking_wait, StopWatch
-from matrix_helper import MatrixHelper
+from pybricks.parameters import Color
+from pybricks.tools import wait as blocking_wait
+from game_clock import GameClock
 from game_control import GameControl
+from game_input import PRESSED, PRESSED_HARD
+from scheduler import Scheduler
 from urandom import randint
 
 
@@ -32,10 +32,10 @@ class BrickPong:
     based on the Pybricks framework. As a template or inspiration the
     code of the game was generated by chat.openai.com and then adapted."""
 
-    def __init__(self, display_res_x, display_res_y):
+    def __init__(self, services):
         # Basic variables
-        self.__screen_width = display_res_x
-        self.__screen_height = display_res_y
+        self.__screen_width = services.resolution[0]
+        self.__screen_height = services.resolution[1]
         self.app_icon = "pong"
         self.app_name = "Pong"
         self.app_color = Color.BLUE
@@ -45,194 +45,196 @@ class BrickPong:
         self.__ball_x_velocity, self.__ball_y_velocity = 1, 1
         self.__render_off = []
         self.__game_speed = 300
+        self.__tick = 100  # period of rendering, input and checks in ms
         self.__hardgame_factor = 2
         self.__score = None
         self.__gameover = None
         self.__quit = False
         self.__reset = True
 
-        self.__paddle_A = self.__Paddle("A", self.__screen_width, self.__screen_height, self.__hardgame_factor)
-        self.__paddle_B = self.__Paddle("B", self.__screen_width, self.__screen_height, self.__hardgame_factor)
-
-        # Initialize software and hardware
-        self.__gamecontrol = GameControl(self.__screen_width, self.__screen_height, self.__game_speed)
-        self.__matrix = MatrixHelper(self.__screen_width, self.__screen_height)  # initialize driver for matrix
-        self.__hub = PrimeHub()  # initialize LEGO Spike Prime Hub
-        self.__button_L = ForceSensor(Port.E)  # initialize LEGO Spike Prime Force Sensor as left button
-        self.__button_R = ForceSensor(Port.F)  # initialize LEGO Spike Prime Force Sensor as right button
+        self.__paddle_A = None  # paddles are built for every round, their length follows the hard game setting
+        self.__paddle_B = None
+
+        # Initialize software and use shared hardware
+        self.__gamecontrol = GameControl(services, self.__game_speed)
+        self.__matrix = services.matrix  # driver for matrix, drawing into the framebuffer until commit
+        self.__hub = services.hub  # LEGO Spike Prime Hub
+        self.__display = services.display  # hub's display, writes only changes
+        self.__game_input = services.game_input  # snapshot of both game controllers, read once per tick
+        self.__hub_input = services.hub_input  # events of the hub's buttons
+        self.__input_log = services.input_log  # records or replays the rounds
         self.__hub_buttons = []  # initialize variable that holds info about pressed button
 
+        # Colors of the game, declared once in the display's palette and drawn by their index
+        self.__color_paddle = self.__matrix.palette.add("pong_paddle", Color.WHITE)
+        self.__color_ball = self.__matrix.palette.add("pong_ball", Color.RED)
+
     class __Paddle:
         def __init__(self, player, screen_width, screen_height, difficulty):
-            """ This class generates the players paddles. Input needed:
+            """ This class generates the players paddles. A paddle is a vertical span of pixels in one column,
+            it is stored as column, top row and length only. Input needed:
             - player (character): "A" or "B"
             - screen_witdh (integer): in pixel; must be 6 or bigger
             - screen_height (integer): in pixel; must be 6 or bigger
             - difficulty (integer): must be 2 or greater; the greater the factor, the smaller the paddles
 
             Readable from outside:
-            - paddle_pix(nested list): list of the paddles coordinates
-            - paddle_pix_off(nested list): list of those coordinates, that will be switched off (after paddles movement)
+            - column(integer): x-coordinate of the paddle
+            - top(integer): y-coordinate of the paddle's upper end
             - paddle_length(integer): length of the paddle
+            - off_start, off_end, on_start, on_end(integer): rows to be switched off and on since the last drawing,
+              set by take_delta()
             """
-            self.paddle_pix = []  # initial list for y-coordinates of paddle
-            self.paddle_pix_off = []
             self.__screen_width = screen_width
             self.__screen_height = screen_height
             self.paddle_length = self.__screen_height // difficulty
+            self.column = None
+            self.top = None
+            self.off_start, self.off_end = 0, 0
+            self.on_start, self.on_end = 0, 0
+            self.__drawn_top = None  # top row of the paddle as it is shown on the display, None if not shown
 
             if player == "A":
-                for i in range(self.paddle_length):
-                    self.paddle_pix.append([0, i + 1])
-
+                self.column = 0
+                self.top = 1
             elif player == "B":
-                x = screen_width - 1
-                for i in range(self.paddle_length):
-                    self.paddle_pix.append([x, self.__screen_height - 1 - self.paddle_length + i])
+                self.column = screen_width - 1
+                self.top = self.__screen_height - 1 - self.paddle_length
 
-        def move_paddle(self, direction, speed):
-            pix_off = []
-
-            def move_one():
-                for i in range(len(self.paddle_pix)):
-                    pix_off.append(self.paddle_pix[i].copy())
-                    self.paddle_pix[i][1] += direction
-
-            def move_many(factor):
-                for i in range(len(self.paddle_pix)):
-                    pix_off.append(self.paddle_pix[i].copy())
-                    self.paddle_pix[i][1] += direction * factor
+        def bottom(self):
+            """Returns the y-coordinate of the paddle's lower end."""
+            return self.top + self.paddle_length - 1
 
+        def move_paddle(self, direction, speed):
             if direction == 1:
-                if self.paddle_pix[-1][1] < self.__screen_height - speed and speed > 1:
-                    move_many(speed)
-                elif self.paddle_pix[-1][1] < self.__screen_height - 1:
-                    move_one()
-                else:
-                    self.paddle_pix_off = []
-                    # print("No move")
+                if self.bottom() < self.__screen_height - speed and speed > 1:
+                    self.top += speed
+                elif self.bottom() < self.__screen_height - 1:
+                    self.top += 1
             elif direction == -1:
-                if self.paddle_pix[0][1] > speed:
-                    move_many(speed)
-                elif self.paddle_pix[0][1] > 0:
-                    move_one()
-                else:
-                    self.paddle_pix_off = []
-                    # print("No move")
-            self.__compare(self.paddle_pix, pix_off)
-
-        def __compare(self, new_pix, off_pix):
-            diff = [i for i in off_pix if i not in new_pix]
-            # print("Diff: ", diff)
-            if len(diff) > 0:
-                self.paddle_pix_off = diff.copy()
-
-    @staticmethod
-    def __wait(time):
-        """ Part of generator function for using parallel computing without threads.
-            Source: https://github.com/orgs/pybricks/discussions/356 """
-        timer = StopWatch()
-        while timer.time() < time:
-            yield
+                if self.top > speed:
+                    self.top -= speed
+                elif self.top > 0:
+                    self.top -= 1
+
+        def take_delta(self):
+            """ Calculates the rows that changed since the last call from the old and the new span and marks the
+            new span as drawn. Afterwards rows off_start to off_end - 1 have to be switched off and rows on_start
+            to on_end - 1 have to be switched on.
+            """
+            old_top = self.__drawn_top
+            new_top = self.top
+            length = self.paddle_length
+            if old_top is None:
+                self.off_start, self.off_end = 0, 0
+                self.on_start, self.on_end = new_top, new_top + length
+            elif new_top > old_top:
+                # moved downwards, upper end gets free
+                self.off_start, self.off_end = old_top, min(new_top, old_top + length)
+                self.on_start, self.on_end = max(old_top + length, new_top), new_top + length
+            elif new_top < old_top:
+                # moved upwards, lower end gets free
+                self.off_start, self.off_end = max(new_top + length, old_top), old_top + length
+                self.on_start, self.on_end = new_top, min(old_top, new_top + length)
+            else:
+                self.off_start, self.off_end = 0, 0
+                self.on_start, self.on_end = 0, 0
+            self.__drawn_top = new_top
+
+    def __render_paddle(self, paddle):
+        # Switch only those pixels of the paddle that changed since it was drawn last
+        paddle.take_delta()
+        for y in range(paddle.off_start, paddle.off_end):
+            self.__matrix.pixel_off(paddle.column, y)
+        for y in range(paddle.on_start, paddle.on_end):
+            self.__matrix.pixel_on(paddle.column, y, self.__color_paddle)
 
     def __render_game(self):
         # Render the current game state.
         while True:
-            # First read those pixels from paddles to be shut off and add them to the render_off-list
-            if len(self.__paddle_A.paddle_pix_off) > 0:
-                for i in self.__paddle_A.paddle_pix_off:
-                    self.__render_off.append(i)
-            if len(self.__paddle_B.paddle_pix_off) > 0:
-                for i in self.__paddle_B.paddle_pix_off:
-                    self.__render_off.append(i)
-            # Then switch off former active pixels
+            # First switch off former active pixels of the ball
             if len(self.__render_off) > 0:
                 for i in range(len(self.__render_off)):
                     self.__matrix.pixel_off(self.__render_off[i][0], self.__render_off[i][1])
                 self.__render_off = []
             # Now switch on pixels for both players and ball
-            for i in range(len(self.__paddle_A.paddle_pix)):
-                self.__matrix.pixel_on(self.__paddle_A.paddle_pix[i][0], self.__paddle_A.paddle_pix[i][1], Color.WHITE)
-            for i in range(len(self.__paddle_B.paddle_pix)):
-                self.__matrix.pixel_on(self.__paddle_B.paddle_pix[i][0], self.__paddle_B.paddle_pix[i][1], Color.WHITE)
-            self.__matrix.pixel_on(self.__ball_x, self.__ball_y, Color.RED)
+            self.__render_paddle(self.__paddle_A)
+            self.__render_paddle(self.__paddle_B)
+            self.__matrix.pixel_on(self.__ball_x, self.__ball_y, self.__color_ball)
+            # push all changed modules at once
+            self.__matrix.commit()
 
             yield
 
     def __update_ball(self):
-        while True:
-            yield from self.__wait(self.__game_speed)
-            # Update ball position
-            self.__render_off.insert(0, [self.__ball_x, self.__ball_y])
-            self.__ball_x += self.__ball_x_velocity
-            self.__ball_y += self.__ball_y_velocity
+        """One step of the ball, called by the game clock. Collisions are checked in the same step, so no bounce
+        is missed when the clock catches up several steps at once."""
+        if self.__gameover:
+            return
+        self.__handle_ball_collisions()
+        # Update ball position
+        self.__render_off.insert(0, [self.__ball_x, self.__ball_y])
+        self.__ball_x += self.__ball_x_velocity
+        self.__ball_y += self.__ball_y_velocity
+
+        # Handle ball collisions with left and right walls
+        if self.__ball_x == 0 or self.__ball_x == self.__screen_width:
+            # print("Ball x {}, y {}, Paddle {}".format(self.__ball_x, self.__ball_y, self.__paddle_A.top))
+            self.__gameover = True
 
     def __handle_ball_collisions(self):
-        while True:
-            # Handle ball collisions with player and computer paddles
-            if self.__ball_x_velocity == -1 and self.__ball_x == 1:
-                for i in range(len(self.__paddle_A.paddle_pix)):
-                    if self.__ball_y_velocity == 1:
-                        if self.__ball_y + 1 == self.__paddle_A.paddle_pix[i][1]:
-                            # print("Paddle A contact")
-                            self.__ball_x_velocity = -self.__ball_x_velocity
-                            self.__score += 1
-                    elif self.__ball_y_velocity == -1:
-                        if self.__ball_y - 1 == self.__paddle_A.paddle_pix[i][1]:
-                            # print("Paddle A contact")
-                            self.__ball_x_velocity = -self.__ball_x_velocity
-                            self.__score += 1
-            elif self.__ball_x_velocity == 1 and self.__ball_x == self.__screen_width - 2:
-                for i in range(len(self.__paddle_B.paddle_pix)):
-                    if self.__ball_y + 1 == self.__paddle_B.paddle_pix[i][1]:
-                        # print("Paddle B contact")
-                        self.__ball_x_velocity = -self.__ball_x_velocity
-
-            # Handle ball collisions with upper and lower walls
-            if self.__ball_y == 0 or self.__ball_y == self.__screen_height - 1:
-                self.__ball_y_velocity = -self.__ball_y_velocity
-
-            # Handle ball collisions with left and right walls
-            if self.__ball_x == 0 or self.__ball_x == self.__screen_width:
-                # print("Ball x {}, y {}, Paddle {}".format(self.__ball_x, self.__ball_y, self.__paddle_A.paddle_pix))
-                self.__gameover = True
-
-            yield
+        # Handle ball collisions with upper and lower walls first, only bounce when moving towards the wall
+        if (self.__ball_y == 0 and self.__ball_y_velocity < 0) or \
+                (self.__ball_y == self.__screen_height - 1 and self.__ball_y_velocity > 0):
+            self.__ball_y_velocity = -self.__ball_y_velocity
+
+        # Handle ball collisions with player and computer paddles, tested at the row the ball will reach next
+        target_y = self.__ball_y + self.__ball_y_velocity
+        if self.__ball_x_velocity == -1 and self.__ball_x == 1:
+            if self.__paddle_A.top <= target_y <= self.__paddle_A.bottom():
+                # print("Paddle A contact")
+                self.__ball_x_velocity = -self.__ball_x_velocity
+                self.__score += 1
+        elif self.__ball_x_velocity == 1 and self.__ball_x == self.__screen_width - 2:
+            if self.__paddle_B.top <= target_y <= self.__paddle_B.bottom():
+                # print("Paddle B contact")
+                self.__ball_x_velocity = -self.__ball_x_velocity
 
     def __update_computer_paddle(self):
         while True:
             # Move computer paddle towards ball
             if self.__ball_x_velocity > 0:
                 factor = randint(0, 2)
-                if self.__paddle_B.paddle_pix[-1][1] - 2 < self.__ball_y:
+                if self.__paddle_B.bottom() - 2 < self.__ball_y:
                     self.__paddle_B.move_paddle(1, factor)
-                elif self.__paddle_B.paddle_pix[0][1] > self.__ball_y:
+                elif self.__paddle_B.top > self.__ball_y:
                     self.__paddle_B.move_paddle(-1, factor)
-            else:
-                self.__paddle_B.paddle_pix_off = []
             yield
 
     def __update_player_paddle(self):
         while True:
-            if self.__button_L.force() > 6 and self.__paddle_A.paddle_pix[0][1] > 1:
+            level_L = self.__game_input.level_L
+            level_R = self.__game_input.level_R
+            if level_L == PRESSED_HARD and self.__paddle_A.top > 1:
                 self.__paddle_A.move_paddle(-1, 2)
-            elif self.__button_L.force() > 2 and self.__paddle_A.paddle_pix[0][1] > 0:
+            elif level_L >= PRESSED and self.__paddle_A.top > 0:
                 self.__paddle_A.move_paddle(-1, 1)
-            elif self.__button_R.force() > 6 and self.__paddle_A.paddle_pix[-1][1] < self.__screen_height - 1:
+            elif level_R == PRESSED_HARD and self.__paddle_A.bottom() < self.__screen_height - 1:
                 self.__paddle_A.move_paddle(1, 2)
-            elif self.__button_R.force() > 2 and self.__paddle_A.paddle_pix[-1][1] < self.__screen_height:
+            elif level_R >= PRESSED and self.__paddle_A.bottom() < self.__screen_height:
                 self.__paddle_A.move_paddle(1, 1)
             yield
 
     def __show_something_on_hub(self):
         while True:
-            self.__hub.display.number(self.__score)
+            self.__display.number(self.__score)
             yield
 
     def __init_game(self):
         self.__matrix.matrix_off()
-        self.__hub.display.text("PONG", 200, 50)
-        blocking_wait(1000)
+        self.__display.scroll("PONG", 200, 50)
+        self.__hub_input.clear()
+        self.__display.hold(self.__hub_input, 1000)  # any button skips the title
 
         self.__hub.speaker.volume(35)  # set volume to non deafening
 
@@ -247,6 +249,8 @@ class BrickPong:
     def __init_pong(self):
         # Initialize game parameters
         self.__ball_x, self.__ball_y = self.__screen_width // 2, self.__screen_height // 2
+        self.__paddle_A = self.__Paddle("A", self.__screen_width, self.__screen_height, self.__hardgame_factor)
+        self.__paddle_B = self.__Paddle("B", self.__screen_width, self.__screen_height, self.__hardgame_factor)
 
         # Initialize or reset the control variables
         self.__score = 0
@@ -255,24 +259,25 @@ class BrickPong:
     def gameplay(self):
         self.__init_game()
         while self.__reset:
+            self.__input_log.start()  # seeds the random generator of the round
             self.__init_pong()
             while not self.__quit:
-                tasks = [
-                    self.__render_game(),
-                    self.__update_player_paddle(),
-                    self.__update_computer_paddle(),
-                    self.__update_ball(),
-                    self.__handle_ball_collisions(),
-                    self.__show_something_on_hub()
-                ]
-
-                while not self.__gameover:
-                    for t in tasks:
-                        next(t)
-                    blocking_wait(100)
+                tasks = Scheduler()
+                tasks.add(self.__game_input.task(), self.__tick, name="game_input")
+                tasks.add(self.__render_game(), self.__tick, name="render_game")
+                tasks.add(self.__update_player_paddle(), self.__tick, name="update_player_paddle")
+                tasks.add(self.__update_computer_paddle(), self.__tick, name="update_computer_paddle")
+                clock = GameClock(self.__game_speed, log=self.__input_log)
+                # a replay does the logged steps in the very tick they were logged in
+                period = self.__tick if self.__input_log.replaying else self.__game_speed
+                tasks.add(clock.task(self.__update_ball), period, period, name="update_ball")
+                tasks.add(self.__show_something_on_hub(), self.__tick, name="show_something_on_hub")
+
+                tasks.run(lambda: self.__gameover)
+                self.__input_log.stop()
+                tasks.print_summary()
                 # Here starts gameover action
                 self.__gamecontrol.gameover()
-                blocking_wait(1500)  # wait one and a half seconds
 
                 self.__quit = True
                 blocking_wait(self.__game_speed)
@@ -284,7 +289,8 @@ class BrickPong:
 
 # Test the class
 if __name__ == "__main__":
-    ponggame = BrickPong(6, 6)
+    from arcade_services import ArcadeServices, DISPLAY_RESOLUTION
+    ponggame = BrickPong(ArcadeServices(DISPLAY_RESOLUTION[0], DISPLAY_RESOLUTION[1]))
     ponggame.gameplay()
 
 # Leave the next line empty to fullfil PEP 8
@@ -18,37 +18,63 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 
 """
 
-from pybricks.hubs import PrimeHub
-from pybricks.pupdevices import ForceSensor
-from pybricks.parameters import Port, Color
-from pybricks.tools import wait as blocking_wait, StopWatch
-from matrix_helper import MatrixHelper
+from pybricks.parameters import Color
+from pybricks.tools import wait as blocking_wait
+from game_clock import GameClock
 from game_control import GameControl
+from game_input import TOUCHED
+from scheduler import Scheduler
 from urandom import randint
 
+# Directions of the snake as (x, y) steps, clockwise; turning is moving one entry on in this tuple
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))  # right, down, left, up
+
 
 class BrickSnake:
     """Implementation of the classic game "Snake" for the PortaBrick Arcade
     based on the Pybricks framework. As inspiration minor parts of the
     code of the game was generated by chat.openai.com and then adapted."""
 
-    def __init__(self, display_res_x, display_res_y):
+    def __init__(self, services):
         # Basic variables
-        self.__resolution = (display_res_x, display_res_y)
+        self.__resolution = services.resolution
         self.__game_speed = 300  # work speed itself
+        self.__tick = 100  # period of rendering, input and checks in ms
         self.app_icon = "snake"
         self.app_name = "Snake"
         self.app_color = Color.ORANGE
 
         # Variables for game SNAKE
         self.__hardgame = False  # If True hitting the wall ends the game
-        self.__direction = ()  # initial direction of snake
-        self.__snake_head = ()  # snake head at game start
-        self.__snake_body = []  # snake body at game start
-        self.__lunch = ()
-        self.__render_on = ()
-        self.__render_off = []
+        self.__direction = 0  # direction of snake, index in DIRECTIONS
+        self.__lunch = -1  # cell of lunch, -1 if there is no free cell left
         self.__snake_had_lunch = None
+        self.__board_full = None  # True if the snake covers the whole display
+
+        # Snake's body as ring buffer of cell numbers (y * width + x) plus a map of occupied cells.
+        # Both are allocated once, the snake can never be longer than the display has cells.
+        self.__cells = self.__resolution[0] * self.__resolution[1]
+        self.__body = [0] * self.__cells  # ring buffer, the head is at __head, the tail __length - 1 entries before
+        self.__occupied = bytearray(self.__cells)  # 1 for each cell covered by the snake
+        self.__head = 0  # position of the head in the ring buffer
+        self.__length = 0  # length of the snake
+
+        # Index of free cells for placing lunch in constant time: the first __free_count entries of __free are the
+        # cells not covered by the snake, __free_index holds the position of each cell in __free.
+        self.__free = [0] * self.__cells
+        self.__free_index = [0] * self.__cells
+        self.__free_count = 0
+
+        # Neighbor of every cell in every direction, built for the chosen game, -1 where the snake hits the wall
+        self.__neighbors = None
+
+        # State of the display as drawn by the renderer, used to draw only the changes
+        self.__drawn_head = -1  # position of the drawn head in the ring buffer, -1 if nothing is drawn
+        # Cells the tail has left since the last drawing. Collected by the movement, as the head may overwrite their
+        # ring buffer entries before they are drawn when several steps pass between two drawings on a full board.
+        self.__released = [0] * self.__cells
+        self.__released_count = 0
+        self.__drawn_lunch = -1  # drawn cell of lunch
 
         self.loop = None  # Prevents a 180 degree turn on same.
         self.__game_counter = None
@@ -56,129 +82,174 @@ class BrickSnake:
         self.__quit = False
         self.__reset = True
 
-        # Initialize software and hardware
-        self.__gamecontrol = GameControl(self.__resolution[0], self.__resolution[1], self.__game_speed)
-        self.__matrix = MatrixHelper(self.__resolution[0], self.__resolution[1])  # initialize driver for matrix
-        self.__hub = PrimeHub()  # initialize LEGO Spike Prime Hub
-        self.__button_L = ForceSensor(Port.E)  # initialize LEGO Spike Prime Force Sensor as left button
-        self.__button_R = ForceSensor(Port.F)  # initialize LEGO Spike Prime Force Sensor as right button
+        # Initialize software and use shared hardware
+        self.__gamecontrol = GameControl(services, self.__game_speed)
+        self.__matrix = services.matrix  # driver for matrix, drawing into the framebuffer until commit
+        self.__hub = services.hub  # LEGO Spike Prime Hub
+        self.__display = services.display  # hub's display, writes only changes
+        self.__game_input = services.game_input  # snapshot of both game controllers, read once per tick
+        self.__hub_input = services.hub_input  # events of the hub's buttons
+        self.__input_log = services.input_log  # records or replays the rounds
         self.__hub_buttons = []  # initialize variable that holds info about pressed button
 
-    @staticmethod
-    def __wait(time):
-        """ Part of generator function for using parallel computing without threads.
-            Source: https://github.com/orgs/pybricks/discussions/356 """
-        timer = StopWatch()
-        while timer.time() < time:
-            yield
+        # Colors of the game, declared once in the display's palette and drawn by their index
+        palette = self.__matrix.palette
+        self.__color_head = palette.add("snake_head", Color(h=235, s=80, v=60))
+        self.__color_body = palette.add("snake_body", Color(h=235, s=80, v=50))
+        self.__color_lunch = palette.add("snake_lunch", self.app_color)
 
     def __input_buttons(self):
         # print("Get input")
         while True:
             # turn button taps to self.direction change
             if self.loop:
-                if self.__button_L.touched():
+                if self.__game_input.level_L >= TOUCHED:
                     # turn snake self.direction counter-clockwise
-                    if self.__direction == (1, 0):  # from left to right
-                        self.__direction = (0, -1)
-                    elif self.__direction == (0, -1):  # from bottom to top
-                        self.__direction = (-1, 0)
-                    elif self.__direction == (-1, 0):  # from right to left
-                        self.__direction = (0, 1)
-                    elif self.__direction == (0, 1):  # from top to bottom
-                        self.__direction = (1, 0)
-                elif self.__button_R.touched():
+                    self.__direction = (self.__direction + 3) % 4
+                elif self.__game_input.level_R >= TOUCHED:
                     # turn snake self.direction clockwise
-                    if self.__direction == (1, 0):  # from left to right
-                        self.__direction = (0, 1)
-                    elif self.__direction == (0, 1):  # from top to bottom
-                        self.__direction = (-1, 0)
-                    elif self.__direction == (-1, 0):  # from right to left
-                        self.__direction = (0, -1)
-                    elif self.__direction == (0, -1):  # from bottom to top
-                        self.__direction = (1, 0)
+                    self.__direction = (self.__direction + 1) % 4
                 self.loop = False
             yield
 
     def __show_something_on_hub(self):
         while True:
-            self.__hub.display.number(self.__game_counter)
+            self.__display.number(self.__game_counter)
             yield
 
-    def __overule_hardgame(self):
-        if not self.__hardgame:
-            if self.__snake_head[0] == 6 and self.__direction == (1, 0):
-                # from left to right reaching screen boarder
-                self.__snake_head = (self.__snake_head[0] - 6, self.__snake_head[1])
-            elif self.__snake_head[1] == 6 and self.__direction == (0, 1):
-                # from top to bottom reaching screen boarder
-                self.__snake_head = (self.__snake_head[0], self.__snake_head[1] - 6)
-            elif self.__snake_head[0] == -1 and self.__direction == (-1, 0):
-                # from right to left reaching screen boarder
-                self.__snake_head = (self.__snake_head[0] + 6, self.__snake_head[1])
-            elif self.__snake_head[1] == -1 and self.__direction == (0, -1):
-                # from bottom to top reaching screen boarder
-                self.__snake_head = (self.__snake_head[0], self.__snake_head[1] + 6)
-
-    def __check_gameover(self):
-        while True:
-            # print("Check gameover")
-            if self.__snake_head[0] == -1 or \
-                    self.__snake_head[1] == -1 or \
-                    self.__snake_head[0] == self.__resolution[0] or \
-                    self.__snake_head[1] == self.__resolution[1]:
-                self.__gameover = True
-                print(self.__gameover)
-            yield
+    def __build_neighbors(self):
+        """ Builds the table of neighbor cells for any resolution. Leaving the display wraps around to the
+        opposite border, in the hard game the wall ends the game instead (neighbor -1).
+        :return: list with one list of neighbor cells per direction
+        """
+        width = self.__resolution[0]
+        height = self.__resolution[1]
+        neighbors = []
+        for step in DIRECTIONS:
+            table = [0] * self.__cells
+            for y in range(height):
+                for x in range(width):
+                    new_x = x + step[0]
+                    new_y = y + step[1]
+                    if 0 <= new_x < width and 0 <= new_y < height:
+                        table[y * width + x] = new_y * width + new_x
+                    elif self.__hardgame:
+                        table[y * width + x] = -1
+                    else:
+                        table[y * width + x] = new_y % height * width + new_x % width
+            neighbors.append(table)
+        return neighbors
+
+    def __occupy_cell(self, cell):
+        """Marks a cell as covered by the snake and removes it from the free cells (swap with last free cell)."""
+        self.__occupied[cell] = 1
+        position = self.__free_index[cell]
+        self.__free_count -= 1
+        last = self.__free[self.__free_count]
+        self.__free[position] = last
+        self.__free_index[last] = position
+
+    def __release_cell(self, cell):
+        """Marks a cell as no longer covered by the snake and appends it to the free cells."""
+        self.__occupied[cell] = 0
+        self.__free[self.__free_count] = cell
+        self.__free_index[cell] = self.__free_count
+        self.__free_count += 1
+
+    def __place_lunch(self):
+        """Puts lunch on a random free cell. If no cell is free the board is full and the game is won."""
+        if self.__free_count == 0:
+            self.__lunch = -1
+            self.__board_full = True
+            self.__gameover = True
+        else:
+            self.__lunch = self.__free[randint(0, self.__free_count - 1)]
 
-    def __check_snake_eats_itself(self):
-        if self.__snake_head in self.__snake_body[1:]:
+    def __check_snake_eats_itself(self, cell):
+        if self.__occupied[cell]:
             self.__gameover = True
 
-    def __check_snake_had_lunch(self):
-        if self.__lunch == self.__snake_head:
+    def __check_snake_had_lunch(self, cell):
+        if self.__lunch == cell:
             self.__hub.speaker.play_notes(["D2/8"], 200)
             self.__game_counter += 1
             self.__snake_had_lunch = True
-            self.__lunch = (randint(0, self.__resolution[0] - 1), randint(0, self.__resolution[1] - 1))
         else:
             self.__snake_had_lunch = False
 
     def __snake_movement(self):
-        while True:
-            yield from self.__wait(self.__game_speed)
-            self.__snake_head = (self.__snake_head[0] + self.__direction[0], self.__snake_head[1] + self.__direction[1])
-            self.__overule_hardgame()
-            self.__snake_body.insert(0, self.__snake_head)
-            self.__check_snake_had_lunch()
-            if not self.__snake_had_lunch:
-                self.__render_off = list(self.__snake_body.pop())
-            else:
-                self.__render_off.clear()
-            self.__render_on = self.__snake_body.copy()
-            self.__check_snake_eats_itself()
-            # prevent snake to make u-turn. Locks input for one movement cycle
-            self.loop = True
+        """One step of the snake, called by the game clock."""
+        if self.__gameover:
+            return
+        cell = self.__neighbors[self.__direction][self.__body[self.__head]]
+        if cell < 0:
+            # Snake hit the wall, there is no cell to move to
+            self.__gameover = True
+            return
+        self.__check_snake_had_lunch(cell)
+        if not self.__snake_had_lunch:
+            # remove the tail, it frees its cell before the head moves on
+            tail = self.__body[(self.__head - self.__length + 1) % self.__cells]
+            self.__release_cell(tail)
+            if self.__released_count < self.__cells:
+                self.__released[self.__released_count] = tail
+                self.__released_count += 1
+        else:
+            self.__length += 1
+        self.__check_snake_eats_itself(cell)
+        if self.__gameover:
+            return
+        # add the new head
+        self.__head = (self.__head + 1) % self.__cells
+        self.__body[self.__head] = cell
+        self.__occupy_cell(cell)
+        if self.__snake_had_lunch:
+            self.__place_lunch()
+        # prevent snake to make u-turn. Locks input for one movement cycle
+        self.loop = True
 
     def __render_matrix_display(self):
+        """ Draws only what changed since the last drawing: moved lunch, removed tail, recoloured old head and
+        new head. Ticks without movement draw nothing.
+        """
+        width = self.__resolution[0]
         while True:
-            # render lunch
-            self.__matrix.pixel_on(self.__lunch[0], self.__lunch[1], Color.ORANGE)
-            # render specific pixels off
-            if self.__render_off:
-                self.__matrix.pixel_off(self.__render_off[0], self.__render_off[1])
-                self.__render_off.clear()
-            # render snake's head
-            self.__matrix.pixel_on(self.__render_on[0][0], self.__render_on[0][1], Color(h=235, s=80, v=60))
-            # render snake's body
-            for i in range(len(self.__render_on[1:])):
-                self.__matrix.pixel_on(self.__render_on[i + 1][0], self.__render_on[i + 1][1], Color(h=235, s=80, v=50))
+            if self.__drawn_head != self.__head or self.__drawn_lunch != self.__lunch:
+                # render lunch
+                if self.__drawn_lunch != self.__lunch:
+                    if self.__lunch >= 0:
+                        self.__matrix.pixel_on(self.__lunch % width, self.__lunch // width, self.__color_lunch)
+                    self.__drawn_lunch = self.__lunch
+                if self.__drawn_head < 0:
+                    # nothing drawn yet, render the whole snake once
+                    position = (self.__head - self.__length + 1) % self.__cells
+                else:
+                    # render pixels the tail has left off, lunch may already lie on one of them after several steps
+                    for i in range(self.__released_count):
+                        cell = self.__released[i]
+                        if not self.__occupied[cell] and cell != self.__lunch:
+                            self.__matrix.pixel_off(cell % width, cell // width)
+                    position = self.__drawn_head
+                self.__released_count = 0
+                # render snake's body from the old head on
+                while position != self.__head:
+                    cell = self.__body[position]
+                    if self.__occupied[cell]:
+                        self.__matrix.pixel_on(cell % width, cell // width, self.__color_body)
+                    position = (position + 1) % self.__cells
+                # render snake's head
+                cell = self.__body[self.__head]
+                self.__matrix.pixel_on(cell % width, cell // width, self.__color_head)
+                self.__drawn_head = self.__head
+                # push all changed modules at once
+                self.__matrix.commit()
             yield
 
     def __init_game(self):
         self.__matrix.matrix_off()
-        self.__hub.display.text("Snake", 200, 50)
-        blocking_wait(1000)
+        self.__display.scroll("Snake", 200, 50)
+        self.__hub_input.clear()
+        self.__display.hold(self.__hub_input, 1000)  # any button skips the title
 
         self.__hub.speaker.volume(35)  # set volume to non deafening
 
@@ -186,44 +257,61 @@ class BrickSnake:
         setting = self.__gamecontrol.set_game_settings()
         self.__hardgame = setting[0]
         self.__game_speed = setting[1]
+        self.__neighbors = self.__build_neighbors()
 
     def __init_snake(self):
         # Initialize snake and it's lunch
-        self.__snake_head = (2, 2)  # snake head at game start
-        self.__snake_body = [(1, 2), (0, 2)]  # snake body at game start
-        self.__snake_body.insert(0, self.__snake_head)
-        self.__render_on = self.__snake_body.copy()
-        self.__lunch = (randint(0, self.__resolution[0] - 1),
-                        randint(0, self.__resolution[1] - 1))  # initial position of lunch
-        self.__direction = (1, 0)  # initial direction of snake
+        width = self.__resolution[0]
+        self.__free_count = 0
+        for i in range(self.__cells):
+            self.__release_cell(i)
+        row = self.__resolution[1] // 2 - 1  # row of the snake at game start
+        self.__length = 0
+        for x in range(3):
+            # snake body from tail (0, row) to head (2, row) at game start
+            cell = row * width + x
+            self.__body[x] = cell
+            self.__occupy_cell(cell)
+            self.__length += 1
+        self.__head = self.__length - 1
+        self.__drawn_head = -1
+        self.__released_count = 0
+        self.__drawn_lunch = -1
+        self.__board_full = False
+        self.__direction = 0  # initial direction of snake, to the right
         self.__snake_had_lunch = False
 
         # Initialize or reset the control variables
         self.__game_counter = 0
         self.__gameover = False
         self.loop = True
+        self.__place_lunch()  # initial position of lunch
 
     def gameplay(self):
         self.__init_game()
         while self.__reset:
+            self.__input_log.start()  # seeds the random generator of the round
             self.__init_snake()
 
             while not self.__quit:
-                tasks = [
-                    self.__render_matrix_display(),
-                    self.__show_something_on_hub(),
-                    self.__input_buttons(),
-                    self.__snake_movement(),
-                    self.__check_gameover()
-                ]
-
-                while not self.__gameover:
-                    for t in tasks:
-                        next(t)
-                    blocking_wait(100)
+                tasks = Scheduler()
+                tasks.add(self.__game_input.task(), self.__tick, name="game_input")
+                tasks.add(self.__render_matrix_display(), self.__tick, name="render_matrix_display")
+                tasks.add(self.__show_something_on_hub(), self.__tick, name="show_something_on_hub")
+                tasks.add(self.__input_buttons(), self.__tick, name="input_buttons")
+                clock = GameClock(self.__game_speed, log=self.__input_log)
+                # a replay does the logged steps in the very tick they were logged in
+                period = self.__tick if self.__input_log.replaying else self.__game_speed
+                tasks.add(clock.task(self.__snake_movement), period, period, name="snake_movement")
+
+                tasks.run(lambda: self.__gameover)
+                self.__input_log.stop()
+                tasks.print_summary()
                 # Here starts gameover action
-                self.__gamecontrol.gameover()
-                blocking_wait(1500)  # wait one and a half seconds
+                if self.__board_full:
+                    self.__gamecontrol.win()
+                else:
+                    self.__gamecontrol.gameover()
                 self.__matrix.matrix_off()  # clear the matrix
                 self.__quit = True  # leave game loop
                 blocking_wait(self.__game_speed)
@@ -235,7 +323,8 @@ class BrickSnake:
 
 # Test the class
 if __name__ == "__main__":
-    snakegame = BrickSnake(6, 6)
+    from arcade_services import ArcadeServices, DISPLAY_RESOLUTION
+    snakegame = BrickSnake(ArcadeServices(DISPLAY_RESOLUTION[0], DISPLAY_RESOLUTION[1]))
     snakegame.gameplay()
 
 # Leave the next line empty to fullfil PEP 8
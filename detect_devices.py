@@ -35,6 +35,7 @@ class DetectDevices:
     def __init__(self):
         self.matrix_available = 0
         self.matrix_ports = []
+        self.force_sensor_ports = []
         self.device_names = None
         self.__ports = None
         self.__scan_ports()
@@ -73,22 +74,12 @@ class DetectDevices:
             64: "SPIKE 3x3 Color Light Matrix",
         }
 
-        # Make a list of known ports.
-        self.__ports = [Port.A, Port.B]
-
-        # On hubs that support it, add more ports.
-        try:
-            self.__ports.append(Port.C)
-            self.__ports.append(Port.D)
-        except AttributeError:
-            pass
-
-        # On hubs that support it, add more ports.
-        try:
-            self.__ports.append(Port.E)
-            self.__ports.append(Port.F)
-        except AttributeError:
-            pass
+        # Make a list of the ports the hub has, in alphabetical order. Hubs with more ports offer more attributes.
+        self.__ports = []
+        for name in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+            port = getattr(Port, name, None)
+            if port is not None:
+                self.__ports.append(port)
 
         # print("Detected Ports", self.ports)
         # print("Matrixes: ", self.matrix_available)
@@ -126,6 +117,10 @@ class DetectDevices:
             # except KeyError:
             #     print(port, ":", "Unknown device with ID", device_id)
 
+            # Register the ports of the Force Sensors, e.g. used as game controllers
+            if device_id == 63:
+                self.force_sensor_ports.append(port)
+
             # Register the count of ColorLightMatrix modules and its ports
             if device_id == 64:
                 self.matrix_available += 1
@@ -0,0 +1,79 @@
+"""
+Class GameClock used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.tools import StopWatch
+
+
+class GameClock:
+    """ Fixed timestep clock for the simulation of a game. The simulation advances in steps of exactly the game
+        speed, the real time of a step does not depend on how long rendering or other tasks take. If the loop runs
+        late, all missed steps are done at once and only the final state gets rendered. If it runs so late that more
+        than max_steps are missed, the surplus is dropped, so the game slows down instead of jumping.
+
+        Input needed:
+        - step (integer): length of one simulation step in ms, e.g. the game speed from GameControl
+        - max_steps (integer): maximum number of steps done at once to catch up
+        - log (InputLog): records the steps done in every tick or replays them instead of following the clock
+
+        Readable from outside:
+        - step (integer): length of one simulation step in ms
+        - steps (integer): number of steps done so far
+        - dropped (integer): number of steps dropped because the loop was too late
+    """
+
+    def __init__(self, step, max_steps=3, log=None):
+        self.step = step
+        self.__max_steps = max_steps
+        self.__log = log
+        self.__clock = StopWatch()
+        self.__next = step  # time of the next step, the first one after one whole step like a StopWatch wait
+        self.steps = 0
+        self.dropped = 0
+
+    def due(self):
+        """ Returns the number of steps due since the last call and moves the clock on by them.
+        :return: number of steps to do now, 0 if none is due
+        """
+        if self.__log is not None and self.__log.replaying:
+            count = self.__log.take_steps()
+            self.steps += count
+            return count
+        now = self.__clock.time()
+        if now < self.__next:
+            return 0
+        count = (now - self.__next) // self.step + 1
+        self.__next += count * self.step
+        if count > self.__max_steps:
+            self.dropped += count - self.__max_steps
+            count = self.__max_steps
+        self.steps += count
+        if self.__log is not None and self.__log.recording:
+            self.__log.add_steps(count)
+        return count
+
+    def task(self, advance):
+        """ Generator task for the Scheduler, add it with the step as period. Calls advance once for every due step.
+        :param advance: function without arguments doing one simulation step
+        :return:
+        """
+        while True:
+            for _ in range(self.due()):
+                advance()
+            yield
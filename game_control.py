@@ -18,11 +18,11 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 
 """
 
-from pybricks.hubs import PrimeHub
 from pybricks.parameters import Button, Color
-from pybricks.tools import wait
-from matrix_helper import MatrixHelper
-from pixel_library import PixelLibrary
+
+from animation import Animation
+from hub_display import SCROLL_PERIOD
+from hub_input import PRESS, REPEAT
 
 
 class GameControl:
@@ -31,61 +31,100 @@ class GameControl:
         GameOver.
     """
 
-    def __init__(self, display_res_x, display_res_y, default_gamespeed):
+    def __init__(self, services, default_gamespeed):
         # Basic variables
-        self.__resolution = (display_res_x, display_res_y)
+        self.__resolution = services.resolution
 
         # Variables for game
         self.__hardgame = True
         self.__game_speed = default_gamespeed
 
-        # Initialize software and hardware
-        self.__matrix = MatrixHelper(self.__resolution[0], self.__resolution[1])  # initialize driver for matrix
-        self.__pixel_lib = PixelLibrary()  # initialize pixel drawings library
-        self.__hub = PrimeHub()  # initialize LEGO Spike Prime Hub
-        self.__hub_buttons = []  # initialize variable that holds info about pressed button
+        # Use shared software and hardware
+        self.__matrix = services.matrix  # driver for matrix
+        self.__pixel_lib = services.pixel_lib  # pixel drawings library
+        self.__pic_offset = services.pic_offset  # position of pixel graphics centered on the display
+        self.__hub = services.hub  # LEGO Spike Prime Hub
+        self.__display = services.display  # hub's display, writes only changes
+        self.__hub_input = services.hub_input  # events of the hub's buttons
+        self.__input_log = services.input_log  # records or replays the rounds, including these settings
+
+        # Colors of the graphics, declared once in the display's palette
+        self.__color_happy = self.__matrix.palette.add("happy", Color.GREEN)
+        self.__color_sad = self.__matrix.palette.add("sad", Color.RED)
+
+        # Animations after a game, shown while the text scrolls on the hub: (picture, color, duration)
+        self.__gameover_frames = ((self.__pixel_lib.pixelpics('smiley_sad'), self.__color_sad, 500),)
+        self.__win_frames = ((self.__pixel_lib.pixelpics('smiley'), self.__color_happy, 500),)
+
+    def __next_event(self):
+        """Waits for the next button event, a text started with scroll() keeps scrolling meanwhile.
+        Returns None as soon as the scroll is finished."""
+        while True:
+            scrolling = self.__display.scrolling()
+            self.__display.update()
+            if scrolling and not self.__display.scrolling():
+                return None
+            event = self.__hub_input.next_event(SCROLL_PERIOD if scrolling else None)
+            if event is not None:
+                return event
 
     def set_game_settings(self):
         """ Sets the game variables for game speed and for the difficulty level.
+        The game speed is the length of one simulation step in ms as used by the GameClock, every difficulty level
+        takes 50 ms off the default, so level 3 plays at the default speed on every load.
         :return:
         """
         action = False  # set input status
 
+        # A replayed round plays with the settings it was recorded with
+        if self.__input_log.replay_enabled:
+            self.__hardgame, self.__game_speed = self.__input_log.settings
+            return self.__hardgame, self.__game_speed
+
         # Let's ask for how hard to play
-        self.__hub.display.text("Hard game?", 200, 50)
+        self.__display.scroll("Hard game?", 200, 50)
+        self.__hub_input.clear()
         while not action:
-            pressed = self.__hub.buttons.pressed()
-            if Button.RIGHT in pressed:
-                self.__hub.display.char("Y")
+            event = self.__next_event()
+            if event is None or event[0] != PRESS:
+                continue
+            if event[1] == Button.RIGHT:
+                self.__display.char("Y")
                 self.__hardgame = True
-            elif Button.LEFT in pressed:
-                self.__hub.display.char("N")
+            elif event[1] == Button.LEFT:
+                self.__display.char("N")
                 self.__hardgame = False
-            elif Button.CENTER in pressed:
+            elif event[1] == Button.CENTER:
                 action = True
 
         action = False  # reset input status
 
         # Let's ask for how fast to play
-        self.__hub.display.text("Difficulty?", 200, 50)
+        self.__display.scroll("Difficulty?", 200, 50)
         difficulty = 3  # set game speed to mid (1 - 5)
+        self.__hub_input.clear()
 
         while not action:
-            pressed = self.__hub.buttons.pressed()
-            self.__hub.display.char(str(difficulty))
-
-            if Button.RIGHT in pressed:
+            if not self.__display.scrolling():
+                # the level follows the question, the display skips the write while it stays the same
+                self.__display.char(str(difficulty))
+            event = self.__next_event()
+            if event is None or (event[0] != PRESS and event[0] != REPEAT):
+                continue
+            if event[1] == Button.RIGHT:
                 if difficulty < 5:
                     difficulty += 1
                     self.__game_speed -= 50
-            elif Button.LEFT in pressed:
+            elif event[1] == Button.LEFT:
                 if difficulty > 1:
                     difficulty -= 1
                     self.__game_speed += 50
-            elif Button.CENTER in pressed:
+            elif event[1] == Button.CENTER and event[0] == PRESS:
                 action = True
-            wait(250)
+            self.__display.char(str(difficulty))
 
+        if self.__input_log.record_enabled:
+            self.__input_log.set_settings(self.__hardgame, self.__game_speed)
         return self.__hardgame, self.__game_speed
 
     def reset_game(self):
@@ -95,28 +134,51 @@ class GameControl:
         action = False  # set input status
         game_quit = None
         game_reset = None
-        self.__matrix.matrix_off()
-        self.__matrix.draw_pixel_graphic(self.__pixel_lib.pixelpics('smiley'), Color.GREEN)
-        self.__hub.display.text("Play again?", 200, 50)
+        self.__matrix.clear()
+        self.__matrix.blit_points(self.__pixel_lib.pixelpics('smiley'), self.__color_happy,
+                                  self.__pic_offset[0], self.__pic_offset[1])
+        self.__matrix.commit()
+        self.__display.scroll("Play again?", 200, 50)
+        self.__hub_input.clear()
         while not action:
-            pressed = self.__hub.buttons.pressed()
-            if Button.RIGHT in pressed:
-                self.__hub.display.char("Y")
+            event = self.__next_event()
+            if event is None or event[0] != PRESS:
+                continue
+            if event[1] == Button.RIGHT:
+                self.__display.char("Y")
                 game_quit = False
                 game_reset = True
-            elif Button.LEFT in pressed:
-                self.__hub.display.char("N")
+            elif event[1] == Button.LEFT:
+                self.__display.char("N")
                 game_reset = False
-            elif Button.CENTER in pressed:
+            elif event[1] == Button.CENTER:
                 self.__matrix.matrix_off()
                 action = True
 
         return game_quit, game_reset
 
     def gameover(self):
+        """ Plays the sad sound, then the graphic for game over is shown until the text has scrolled by or a button
+        of the hub is pressed.
+        :return:
+        """
         self.__matrix.matrix_off()
         # make a sad sound
         self.__hub.speaker.play_notes(["B3/2", "B2/2"], 160)
         # show a grafik for game over
-        self.__matrix.draw_pixel_graphic(self.__pixel_lib.pixelpics('smiley_sad'), Color.RED)
-        self.__hub.display.text("Game Over", 200, 50)
+        self.__display.scroll("Game Over", 200, 50)
+        animation = Animation(self.__matrix, self.__gameover_frames, loop=True, offset=self.__pic_offset)
+        animation.play(self.__hub_input, self.__display)
+
+    def win(self):
+        """ Plays the happy sound, then the graphic for a won game is shown until the text has scrolled by or a
+        button of the hub is pressed.
+        :return:
+        """
+        self.__matrix.matrix_off()
+        # make a happy sound
+        self.__hub.speaker.play_notes(["C4/8", "E4/8", "G4/4"], 160)
+        # show a grafik for a won game
+        self.__display.scroll("You win", 200, 50)
+        animation = Animation(self.__matrix, self.__win_frames, loop=True, offset=self.__pic_offset)
+        animation.play(self.__hub_input, self.__display)
@@ -0,0 +1,93 @@
+"""
+Class GameInput used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+# Levels of a game controller, each level includes the ones below
+RELEASED = 0
+TOUCHED = 1
+PRESSED = 2
+PRESSED_HARD = 3
+
+
+class GameInput:
+    """ Snapshot of both game controllers. read() reads each Force Sensor exactly once and stores force and level,
+        all game tasks of the same tick work on this snapshot instead of reading the sensors again.
+
+        Input needed:
+        - button_L, button_R: LEGO Spike Prime Force Sensors used as left and right game controller
+        - touch_force (float): force in N from which a controller counts as touched
+        - press_force (float): force in N from which a controller counts as pressed
+        - hard_force (float): force in N from which a controller counts as pressed hard
+        - log (InputLog): records the levels of every read or replays them instead of reading the sensors; in a
+          replay the forces are set to the lowest force of the replayed level
+
+        Readable from outside:
+        - force_L, force_R (float): force in N of the last read
+        - level_L, level_R (integer): RELEASED, TOUCHED, PRESSED or PRESSED_HARD of the last read
+    """
+
+    def __init__(self, button_L, button_R, touch_force=0.5, press_force=2, hard_force=6, log=None):
+        self.__button_L = button_L
+        self.__button_R = button_R
+        self.__touch_force = touch_force
+        self.__press_force = press_force
+        self.__hard_force = hard_force
+        self.__log = log
+        self.__level_forces = (0, touch_force, press_force, hard_force)  # force reported for a replayed level
+
+        self.force_L = 0
+        self.force_R = 0
+        self.level_L = RELEASED
+        self.level_R = RELEASED
+
+    def __level(self, force):
+        """Converts a force to the level of the controller."""
+        if force > self.__hard_force:
+            return PRESSED_HARD
+        elif force > self.__press_force:
+            return PRESSED
+        elif force >= self.__touch_force:
+            return TOUCHED
+        return RELEASED
+
+    def read(self):
+        """ Reads both controllers once and updates the snapshot.
+        :return:
+        """
+        if self.__log is not None and self.__log.replaying:
+            levels = self.__log.next_tick()
+            if levels is not None:
+                self.level_L, self.level_R = levels
+                self.force_L = self.__level_forces[self.level_L]
+                self.force_R = self.__level_forces[self.level_R]
+                return
+        self.force_L = self.__button_L.force()
+        self.force_R = self.__button_R.force()
+        self.level_L = self.__level(self.force_L)
+        self.level_R = self.__level(self.force_R)
+        if self.__log is not None and self.__log.recording:
+            self.__log.tick(self.level_L, self.level_R)
+
+    def task(self):
+        """ Generator task for the Scheduler, must be added before all tasks using the snapshot.
+        :return:
+        """
+        while True:
+            self.read()
+            yield
@@ -0,0 +1,432 @@
+"""
+Benchmarks of the PortaBrick Arcade on the emulated hub
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Usage: python host/benchmark.py [--save] [--tolerance PERCENT] [SESSION ...]
+
+Drives the games through scripted sessions and reports per tick: CPU time on the PC, writes to the color matrices
+and the hub's display, force sensor reads and allocated memory, plus boot-to-menu time of the main program.
+The results are compared to the baseline in benchmark_baseline.json, --save stores the results as new baseline.
+A tick is the work done between two waits of the Scheduler, the menu's "ticks" are the samples of HubInput.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from run_arcade import run, HOST_DIR
+from emulator import tap, COLOR_LIGHT_MATRIX
+from scheduler import Scheduler
+
+BASELINE = os.path.join(HOST_DIR, "benchmark_baseline.json")
+
+# Inputs to browse the main menu forth and back after the introduction
+MENU_BROWSING = tap("RIGHT", 20000) + tap("LEFT", 22000) + tap("RIGHT", 24000) + tap("LEFT", 26000)
+
+
+class Recorder:
+    """ Measures the work between two waits. Each measurement is stored with the name of the function that
+        called wait(), which tells menus and blocking sequences apart. Ticks of a Scheduler are stored with the
+        name of the Scheduler: "tick" for the games, "animation" for an Animation.
+    """
+
+    def __init__(self, track_allocations, tagger=None):
+        self.frames = []  # (caller, virtual time, cpu time in ms, matrix writes, display writes, reads, bytes, tag)
+        self.boot_to_menu = None  # (cpu time in ms, virtual time in ms)
+        self.excluded = 0.0  # time spent in pilots, not counted as work of the arcade
+        self.__alloc_peak = 0  # allocation peak of the arcade before the pilots ran, their memory is not counted
+        self.__track_allocations = track_allocations
+        self.__tagger = tagger  # function returning a tag for each frame, e.g. the length of the snake
+        self.__start = time.perf_counter()
+        self.__last = self.__start
+        self.__counters = (0, 0, 0)
+        self.label = None  # name of the Scheduler whose tick is running, set by label_ticks()
+
+    def label_ticks(self):
+        """ Wraps Scheduler.tick, so every wait during a tick is stored with the name of its Scheduler.
+        :return: the original Scheduler.tick, to be restored after the session
+        """
+        original = Scheduler.tick
+
+        def tick(scheduler):
+            outer = self.label
+            self.label = scheduler.name
+            try:
+                original(scheduler)
+            finally:
+                self.label = outer
+        Scheduler.tick = tick
+        return original
+
+    def exclude(self, function):
+        """Wraps a pilot, so the time and the memory it needs are not counted."""
+        def wrapper(emu):
+            if self.__track_allocations:
+                self.__alloc_peak = max(self.__alloc_peak, tracemalloc.get_traced_memory()[1] - self.__alloc_base)
+            start = time.perf_counter()
+            function(emu)
+            self.excluded += time.perf_counter() - start
+            if self.__track_allocations:
+                tracemalloc.reset_peak()
+        return wrapper
+
+    def on_wait(self, emu):
+        now = time.perf_counter()
+        cpu = (now - self.__last - self.excluded) * 1000
+        counters = (emu.matrix_writes, emu.hub_display_writes, emu.sensor_reads)
+        allocated = 0
+        if self.__track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated = max(self.__alloc_peak, peak - self.__alloc_base)
+        # The frame of the caller is looked up for every wait, so the frame object exists before the allocations
+        # of the next frame are counted, whichever name is stored
+        caller = sys._getframe(2).f_code.co_name
+        if self.label is not None:
+            caller = self.label  # tick of a Scheduler, stored with the name of the Scheduler
+        self.frames.append((caller, emu.now, cpu,
+                            counters[0] - self.__counters[0],
+                            counters[1] - self.__counters[1],
+                            counters[2] - self.__counters[2],
+                            allocated,
+                            self.__tagger(emu) if self.__tagger is not None else None))
+        # Boot ends with the first sample of the menu loop in dialog(), the howto before it samples the buttons too
+        if self.boot_to_menu is None and caller == "next_event" and sys._getframe(3).f_code.co_name == "dialog":
+            self.boot_to_menu = ((now - self.__start - self.excluded) * 1000, emu.now)
+        self.__counters = counters
+        self.excluded = 0.0
+        if self.__track_allocations:
+            tracemalloc.reset_peak()
+            self.__alloc_base = tracemalloc.get_traced_memory()[0]
+            self.__alloc_peak = 0
+        self.__last = time.perf_counter()
+
+    def start_allocations(self):
+        tracemalloc.start()
+        self.__alloc_base = tracemalloc.get_traced_memory()[0]
+
+
+def find(emu, res_x, match):
+    """ Returns the coordinates of all pixels of the emulated display whose color fits.
+    :param emu: the emulator
+    :param res_x: x-resolution of the display
+    :param match: function getting a color and returning True if it fits
+    :return: list of (x, y)
+    """
+    ports = [port for port in sorted(emu.ports) if emu.ports[port] == COLOR_LIGHT_MATRIX]
+    modules_x = res_x // 3
+    found = []
+    for index in range(len(ports)):
+        pixels = emu.matrices.get(ports[index], ())
+        for slot in range(len(pixels)):
+            if pixels[slot].v > 0 and match(pixels[slot]):
+                found.append((index % modules_x * 3 + slot % 3, index // modules_x * 3 + slot // 3))
+    return found
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def is_snake(color):
+    return color.h == 235
+
+
+def is_snake_head(color):
+    return color.h == 235 and color.v == 60
+
+
+def is_lunch(color):
+    return color.h == 30 and color.s == 100
+
+
+def is_ball(color):
+    return color.h == 0 and color.s == 100
+
+
+def is_paddle(color):
+    return color.s == 0
+
+
+def prompt_pilot(answers):
+    """ Answers the prompts of GameControl. The characters shown on the hub's display are collected, as soon as
+        they end with a prompt, the button given for it is pressed and then the center button confirms.
+    :param answers: dict prompt -> name of the hub button to press first or None
+    """
+    state = {"text": "", "pending": [], "writes": 0}
+
+    def pilot(emu):
+        if emu.hub_display_writes != state["writes"] and isinstance(emu.hub_display, str):
+            state["writes"] = emu.hub_display_writes
+            state["text"] = (state["text"] + emu.hub_display)[-12:]
+            for prompt in answers:
+                if state["text"].endswith(prompt):
+                    state["text"] = ""
+                    now = emu.now
+                    if answers[prompt] is not None:
+                        state["pending"] += [(now + 100, answers[prompt], True), (now + 200, answers[prompt], False)]
+                    state["pending"] += [(now + 400, "CENTER", True), (now + 500, "CENTER", False)]
+        while state["pending"] and state["pending"][0][0] <= emu.now:
+            entry = state["pending"].pop(0)
+            if entry[2]:
+                emu.pressed.add(entry[1])
+            else:
+                emu.pressed.discard(entry[1])
+
+    return pilot
+
+
+def game_pilot(prompts, steering):
+    """Combines answering the prompts with steering the game."""
+    def pilot(emu):
+        prompts(emu)
+        steering(emu)
+    return pilot
+
+
+def snake_pilot(res_x, res_y):
+    """ Steers the snake towards its lunch with the force sensors, avoiding its own body, so the snake grows.
+        The session plays on forever: a soft game at middle difficulty, after a game over it is played again.
+
+        The game reads the controllers in the first tick after a step, which is before the pilot sees that step
+        on the display. So the pilot plans one step ahead: when it sees the head, the next step is already decided
+        and the controllers it sets now steer the step after.
+    """
+    state = {"head": None, "next": (1, 0)}
+
+    def steer(emu):
+        heads = find(emu, res_x, is_snake_head)
+        if len(heads) != 1:
+            state["head"] = None
+            return
+        if heads[0] == state["head"]:
+            return
+        head = heads[0]
+        if state["head"] is None:
+            state["next"] = (1, 0)  # a new game starts to the right
+        state["head"] = head
+
+        direction = state["next"]
+        ahead = ((head[0] + direction[0]) % res_x, (head[1] + direction[1]) % res_y)
+        body = find(emu, res_x, is_snake)
+        lunches = find(emu, res_x, is_lunch)
+        best, best_distance = direction, None
+        for turn in (direction, (direction[1], -direction[0]), (-direction[1], direction[0])):
+            cell = ((ahead[0] + turn[0]) % res_x, (ahead[1] + turn[1]) % res_y)
+            if cell in body or cell == head:
+                continue
+            distance = 0
+            if lunches:
+                distance = min(abs(lunches[0][0] - cell[0]), res_x - abs(lunches[0][0] - cell[0])) + \
+                    min(abs(lunches[0][1] - cell[1]), res_y - abs(lunches[0][1] - cell[1]))
+            if best_distance is None or distance < best_distance:
+                best, best_distance = turn, distance
+        left, right = emu.force_sensors()
+        emu.forces[left] = 1.0 if best == (direction[1], -direction[0]) else 0.0  # turn counter-clockwise
+        emu.forces[right] = 1.0 if best == (-direction[1], direction[0]) else 0.0  # turn clockwise
+        state["next"] = best
+
+    return game_pilot(prompt_pilot({"Hard game?": "LEFT", "Difficulty?": None, "Play again?": "RIGHT"}), steer)
+
+
+def hard_snake_pilot(res_x, res_y):
+    """Chooses the hard game and leaves the snake alone, so it runs into the wall."""
+    return prompt_pilot({"Hard game?": "RIGHT", "Difficulty?": None})
+
+
+def pong_pilot(res_x, res_y):
+    """ Moves the player's paddle towards the ball with the force sensors. After a game over it is played again."""
+
+    def steer(emu):
+        balls = find(emu, res_x, is_ball)
+        paddle = [pixel[1] for pixel in find(emu, res_x, is_paddle) if pixel[0] == 0]
+        left, right = emu.force_sensors()
+        emu.forces[left] = 0.0
+        emu.forces[right] = 0.0
+        if not balls or not paddle:
+            return
+        if balls[0][1] < min(paddle):
+            emu.forces[left] = 4.0
+        elif balls[0][1] > max(paddle):
+            emu.forces[right] = 4.0
+
+    return game_pilot(prompt_pilot({"Hard game?": "LEFT", "Difficulty?": None, "Play again?": "RIGHT"}), steer)
+
+
+def snake_length(res_x, res_y):
+    """Returns a tagger counting the pixels of the snake."""
+    return lambda emu: len(find(emu, res_x, is_snake))
+
+
+# Sessions: program, scripted inputs, pilot, tagger, virtual time limit, measured frames and their selection
+SESSIONS = {
+    "snake_short": {"program": "snake", "script": (), "pilot": snake_pilot, "tagger": snake_length,
+                    "time_limit": 120000, "frames": "tick", "select": lambda frame: frame[7] <= 5},
+    "snake_long": {"program": "snake", "script": (), "pilot": snake_pilot, "tagger": snake_length,
+                   "time_limit": 120000, "frames": "tick", "select": lambda frame: frame[7] >= 10},
+    "pong_rally": {"program": "pong", "script": (), "pilot": pong_pilot, "tagger": None,
+                   "time_limit": 120000, "frames": "tick", "select": None},
+    "menu": {"program": "main", "script": MENU_BROWSING, "pilot": None, "tagger": None,
+             "time_limit": 30000, "frames": "next_event", "select": lambda frame: frame[1] >= 19000},
+    "gameover": {"program": "snake", "script": (), "pilot": hard_snake_pilot, "tagger": None,
+                 "time_limit": 40000, "frames": "gameover", "select": None},
+    # The same games on bigger displays, the cost per tick must not grow with the display
+    "snake_6x12": {"program": "snake", "script": (), "pilot": snake_pilot, "tagger": snake_length,
+                   "time_limit": 120000, "frames": "tick", "select": None, "resolution": (6, 12)},
+    "snake_12x12": {"program": "snake", "script": (), "pilot": snake_pilot, "tagger": snake_length,
+                    "time_limit": 120000, "frames": "tick", "select": None, "resolution": (12, 12)},
+    "pong_12x12": {"program": "pong", "script": (), "pilot": pong_pilot, "tagger": None,
+                   "time_limit": 120000, "frames": "tick", "select": None, "resolution": (12, 12)},
+}
+
+# Resolution of the sessions which do not name one
+RESOLUTION = (6, 6)
+
+
+def measure(name, track_allocations):
+    """ Runs one session and collects its frames.
+    :param name: name of the session
+    :param track_allocations: True measures allocated memory instead of CPU time
+    :return: the recorder of the session
+    """
+    session = SESSIONS[name]
+    resolution = session.get("resolution", RESOLUTION)
+    tagger = None
+    if session["tagger"] is not None:
+        tagger = session["tagger"](resolution[0], resolution[1])
+    recorder = Recorder(track_allocations, tagger)
+    listeners = []
+    if session["pilot"] is not None:
+        listeners.append(recorder.exclude(session["pilot"](resolution[0], resolution[1])))
+    original_tick = recorder.label_ticks()
+    if track_allocations:
+        recorder.start_allocations()
+    try:
+        run(session["program"], session["script"], seed=1, time_limit=session["time_limit"],
+            listeners=listeners, wait_listeners=[recorder.on_wait], resolution=resolution)
+    finally:
+        Scheduler.tick = original_tick
+        if track_allocations:
+            tracemalloc.stop()
+    return recorder
+
+
+def select(recorder, session):
+    """ Returns the frames of a session that are measured.
+    For "gameover" all work from the last tick of the game up to the first sample of the following menu is one frame.
+    """
+    frames = recorder.frames
+    if session["frames"] != "gameover":
+        return [frame for frame in frames if frame[0] == session["frames"]
+                and (session["select"] is None or session["select"](frame))]
+    last_tick = max(i for i in range(len(frames)) if frames[i][0] == "tick")
+    following = frames[last_tick + 1:]
+    first_menu = min(i for i in range(len(following)) if following[i][0] == "next_event")
+    block = following[:first_menu + 1]
+    return [("gameover", block[-1][1]) + tuple(sum(frame[i] for frame in block) for i in range(2, 6))
+            + (max(frame[6] for frame in block), None)]
+
+
+def summarize(name):
+    """ Runs a session twice, once for the time and once for the allocations, and sums up the frames.
+    :param name: name of the session
+    :return: dict of results
+    """
+    session = SESSIONS[name]
+    timed = measure(name, False)
+    frames = select(timed, session)
+    allocations = [frame[6] for frame in select(measure(name, True), session)]
+    if not frames:
+        return {"ticks": 0}
+    count = len(frames)
+    result = {
+        "ticks": count,
+        "cpu_ms_avg": sum(frame[2] for frame in frames) / count,
+        "cpu_ms_max": max(frame[2] for frame in frames),
+        "matrix_writes_avg": sum(frame[3] for frame in frames) / count,
+        "matrix_writes_max": max(frame[3] for frame in frames),
+        "display_writes_avg": sum(frame[4] for frame in frames) / count,
+        "sensor_reads_avg": sum(frame[5] for frame in frames) / count,
+        "alloc_bytes_avg": sum(allocations) / max(len(allocations), 1),
+        "alloc_bytes_max": max(allocations) if allocations else 0,
+    }
+    if timed.boot_to_menu is not None and session["program"] == "main":
+        result["boot_cpu_ms"] = timed.boot_to_menu[0]
+        result["boot_virtual_ms"] = timed.boot_to_menu[1]
+    return result
+
+
+# Metrics which depend on the speed of the PC, they are compared more loosely
+NOISY = ("cpu_ms_avg", "cpu_ms_max", "boot_cpu_ms")
+
+
+def compare(results, baseline, tolerance):
+    """ Compares the results with the baseline.
+    :return: list of regressions as text
+    """
+    regressions = []
+    for name in results:
+        for metric in results[name]:
+            if name not in baseline or metric not in baseline[name] or metric == "ticks":
+                continue
+            old, new = baseline[name][metric], results[name][metric]
+            allowed = old * (1 + tolerance * (4 if metric in NOISY else 1)) + (0.05 if metric in NOISY else 0.5)
+            if new > allowed:
+                regressions.append("{} {}: {:.3f} -> {:.3f}".format(name, metric, old, new))
+    return regressions
+
+
+def main(args):
+    save = "--save" in args
+    tolerance = 0.25
+    if "--tolerance" in args:
+        tolerance = float(args[args.index("--tolerance") + 1]) / 100
+    names = [arg for arg in args if arg in SESSIONS] or list(SESSIONS)
+
+    results = {}
+    for name in names:
+        results[name] = summarize(name)
+        print(name)
+        for metric in results[name]:
+            print("    {:20} {:10.3f}".format(metric, results[name][metric]))
+
+    if save:
+        baseline = {}
+        if os.path.exists(BASELINE):
+            with open(BASELINE) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(BASELINE, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print("Baseline saved to", BASELINE)
+        return 0
+
+    if not os.path.exists(BASELINE):
+        print("No baseline to compare with, run with --save to store one.")
+        return 0
+    with open(BASELINE) as file:
+        regressions = compare(results, json.load(file), tolerance)
+    for regression in regressions:
+        print("Regression:", regression)
+    if not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
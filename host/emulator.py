@@ -0,0 +1,192 @@
+"""
+Emulated hub for running the PortaBrick Arcade on a PC
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import random
+
+# Device ids as reported by PUPDevice.info()
+FORCE_SENSOR = 63
+COLOR_LIGHT_MATRIX = 64
+
+# Port names of the emulated hub. The real hub has A to F, the emulated one offers more to try bigger displays.
+PORT_NAMES = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Default setup of the PortaBrick Arcade: four matrices and two force sensors
+DEFAULT_PORTS = {
+    "A": COLOR_LIGHT_MATRIX,
+    "B": COLOR_LIGHT_MATRIX,
+    "C": COLOR_LIGHT_MATRIX,
+    "D": COLOR_LIGHT_MATRIX,
+    "E": FORCE_SENSOR,
+    "F": FORCE_SENSOR,
+}
+
+
+class Emulator:
+    """ State of the emulated hub shared by the pybricks stand-in modules: a virtual clock, the devices attached to
+        the ports, scripted inputs for the hub's buttons and the force sensors, and a seeded random generator.
+
+        Time only passes when the program waits (wait(), blocking display and speaker calls), so a session runs as
+        fast as the PC allows. When the virtual clock passes the time limit, SystemExit is raised from the next wait,
+        just like pressing the stop button on the hub.
+
+        Readable from outside:
+        - now (integer): virtual time in ms
+        - ports (dict): port name -> device id
+        - matrices (dict): port name -> list of the 9 colors shown by the matrix on that port
+        - matrix_writes (integer): number of ColorLightMatrix.on()/off() calls
+        - hub_display_writes (integer): number of calls drawing on the hub's 5x5 display
+        - sensor_reads (integer): number of ForceSensor reads
+        - waits (integer): number of wait() calls
+        - button_polls (integer): number of reads of the hub's buttons
+        - listeners (list): functions called with the emulator whenever virtual time passes
+        - wait_listeners (list): functions called with the emulator at every wait(), before the time passes
+    """
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self, ports=None, script=(), seed=0, time_limit=None):
+        """ Resets the emulated hub.
+        :param ports: dict port name -> device id, defaults to DEFAULT_PORTS
+        :param script: iterable of inputs (time in ms, target, value), target is a hub button name like "CENTER"
+                       or the port name of a force sensor like "E"; value is True/False for buttons and the force
+                       in N for force sensors
+        :param seed: seed of the random generator used by urandom
+        :param time_limit: virtual time in ms after which the session is stopped, None runs endlessly
+        :return:
+        """
+        self.now = 0
+        self.ports = dict(DEFAULT_PORTS if ports is None else ports)
+        self.matrices = {}
+        self.pressed = set()
+        self.forces = {}
+        self.random = random.Random(seed)
+        self.seed = seed
+        self.time_limit = time_limit
+        self.hub_display = None
+        self.listeners = []
+        self.wait_listeners = []
+        self.matrix_writes = 0
+        self.hub_display_writes = 0
+        self.sensor_reads = 0
+        self.waits = 0
+        self.button_polls = 0
+        self.__script = sorted(script, key=lambda entry: entry[0])
+        self.__next = 0
+        self.apply_script()
+
+    def apply_script(self):
+        """ Applies all scripted inputs that are due at the current virtual time.
+        :return:
+        """
+        while self.__next < len(self.__script) and self.__script[self.__next][0] <= self.now:
+            target, value = self.__script[self.__next][1], self.__script[self.__next][2]
+            if target in self.ports:
+                self.forces[target] = float(value)
+            elif value:
+                self.pressed.add(target)
+                if target == "BLUETOOTH":
+                    # The Bluetooth button is the stop button of the arcade
+                    raise SystemExit
+            else:
+                self.pressed.discard(target)
+            self.__next += 1
+
+    def advance(self, time):
+        """ Lets the given time in ms pass on the virtual clock.
+        :param time: time in ms
+        :return:
+        """
+        if time > 0:
+            self.now += int(time)
+        self.apply_script()
+        for listener in self.listeners:
+            listener(self)
+        if self.time_limit is not None and self.now >= self.time_limit:
+            raise SystemExit
+
+    def script_done(self):
+        """Returns True if all scripted inputs were applied."""
+        return self.__next >= len(self.__script)
+
+    def force_sensors(self):
+        """Returns the port names of the force sensors in the order of their ports, the first is the left one."""
+        return [port for port in sorted(self.ports) if self.ports[port] == FORCE_SENSOR]
+
+    def render(self, res_x, res_y):
+        """ Returns the emulated display as text, one character per pixel ('.' for off, '#' for on).
+        :param res_x: resolution of the display in pixel, the matrices are used in the order of their ports
+        :param res_y: resolution of the display in pixel
+        :return: string with one line per row
+        """
+        ports = [port for port in sorted(self.ports) if self.ports[port] == COLOR_LIGHT_MATRIX]
+        lines = []
+        for y in range(res_y):
+            line = ""
+            for x in range(res_x):
+                port = ports[y // 3 * (res_x // 3) + x // 3]
+                colors = self.matrices.get(port)
+                on = colors is not None and colors[y % 3 * 3 + x % 3].v > 0
+                line += "#" if on else "."
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def ports_for(res_x, res_y):
+    """ Returns the setup for a display of the given resolution: the matrices on the first ports, followed by two
+    force sensors.
+    :param res_x: resolution of the display in pixel, multiple of 3
+    :param res_y: resolution of the display in pixel, multiple of 3
+    :return: dict port name -> device id
+    """
+    modules = (res_x // 3) * (res_y // 3)
+    if modules + 2 > len(PORT_NAMES):
+        raise ValueError("The emulated hub has no ports for {} matrices".format(modules))
+    ports = {}
+    for name in PORT_NAMES[:modules]:
+        ports[name] = COLOR_LIGHT_MATRIX
+    for name in PORT_NAMES[modules:modules + 2]:
+        ports[name] = FORCE_SENSOR
+    return ports
+
+
+def tap(target, at, duration=100):
+    """ Returns the script entries for a short press of a hub button.
+    :param target: name of the hub button, like "CENTER"
+    :param at: time of the press in ms
+    :param duration: time in ms until the button is released
+    :return: list of script entries
+    """
+    return [(at, target, True), (at + duration, target, False)]
+
+
+def push(port, at, force, duration=100):
+    """ Returns the script entries for pushing a force sensor.
+    :param port: port name of the force sensor, like "E"
+    :param at: time of the push in ms
+    :param force: force in N
+    :param duration: time in ms until the sensor is released
+    :return: list of script entries
+    """
+    return [(at, port, force), (at + duration, port, 0)]
+
+
+# The one emulated hub used by all stand-in modules
+emulator = Emulator()
@@ -0,0 +1,102 @@
+"""
+Stand-in for pybricks.hubs
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from emulator import emulator
+from pybricks.parameters import Button
+
+
+class _Display:
+    """5x5 display of the hub, remembers what is shown. Text blocks as long as it scrolls on the real hub."""
+
+    def __show(self, content):
+        emulator.hub_display_writes += 1
+        emulator.hub_display = content
+
+    def number(self, number):
+        self.__show(str(number))
+
+    def char(self, char):
+        self.__show(str(char))
+
+    def icon(self, icon):
+        self.__show(icon)
+
+    def pixel(self, row, column, brightness=100):
+        self.__show((row, column, brightness))
+
+    def text(self, text, on=500, off=50):
+        for char in text:
+            self.__show(char)
+            emulator.advance(on + off)
+
+    def off(self):
+        self.__show(None)
+
+
+class _Buttons:
+    """Buttons of the hub, pressed by the scripted inputs of the emulator."""
+
+    def pressed(self):
+        emulator.button_polls += 1
+        result = set()
+        for name in emulator.pressed:
+            result.add(getattr(Button, name))
+        return result
+
+
+class _Speaker:
+    """Speaker of the hub. Playing blocks as long as on the real hub."""
+
+    def __init__(self):
+        self.__volume = 100
+
+    def volume(self, volume=None):
+        if volume is None:
+            return self.__volume
+        self.__volume = volume
+
+    def beep(self, frequency=500, duration=100):
+        emulator.advance(duration)
+
+    def play_notes(self, notes, tempo=120):
+        whole = 4 * 60000 / tempo
+        for note in notes:
+            length = note.split("/")[1] if "/" in note else "4"
+            dotted = length.endswith(".")
+            duration = whole / int(length.rstrip("._"))
+            emulator.advance(duration * 1.5 if dotted else duration)
+
+
+class _System:
+    def __init__(self):
+        self.stop_button = Button.CENTER
+
+    def set_stop_button(self, button):
+        self.stop_button = button
+
+
+class PrimeHub:
+    """LEGO Spike Prime Hub with display, buttons, speaker and system."""
+
+    def __init__(self):
+        self.display = _Display()
+        self.buttons = _Buttons()
+        self.speaker = _Speaker()
+        self.system = _System()
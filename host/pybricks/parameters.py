@@ -0,0 +1,94 @@
+"""
+Stand-in for pybricks.parameters
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from emulator import PORT_NAMES
+
+
+class Color:
+    """Color in HSV like pybricks.parameters.Color, comparable and hashable."""
+
+    def __init__(self, h, s=100, v=100):
+        self.h = h
+        self.s = s
+        self.v = v
+
+    def __eq__(self, other):
+        return isinstance(other, Color) and (self.h, self.s, self.v) == (other.h, other.s, other.v)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.h, self.s, self.v))
+
+    def __repr__(self):
+        return "Color(h={}, s={}, v={})".format(self.h, self.s, self.v)
+
+
+Color.NONE = Color(0, 0, 0)
+Color.BLACK = Color(0, 0, 10)
+Color.GRAY = Color(0, 0, 50)
+Color.WHITE = Color(0, 0, 100)
+Color.RED = Color(0, 100, 100)
+Color.ORANGE = Color(30, 100, 100)
+Color.BROWN = Color(30, 100, 50)
+Color.YELLOW = Color(60, 100, 100)
+Color.GREEN = Color(120, 100, 100)
+Color.CYAN = Color(180, 100, 100)
+Color.BLUE = Color(240, 100, 100)
+Color.VIOLET = Color(270, 100, 100)
+Color.MAGENTA = Color(300, 100, 100)
+
+
+class _Name:
+    """Named constant, used for ports, buttons and icons."""
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+
+    def __repr__(self):
+        return self.kind + "." + self.name
+
+
+class Port:
+    """Ports of the emulated hub, A to F like the real hub and some more for bigger displays (see PORT_NAMES)."""
+
+
+for _name in PORT_NAMES:
+    setattr(Port, _name, _Name("Port", _name))
+del _name
+
+
+class Button:
+    LEFT = _Name("Button", "LEFT")
+    RIGHT = _Name("Button", "RIGHT")
+    CENTER = _Name("Button", "CENTER")
+    BLUETOOTH = _Name("Button", "BLUETOOTH")
+
+
+class Icon:
+    ARROW_RIGHT_DOWN = _Name("Icon", "ARROW_RIGHT_DOWN")
+    ARROW_LEFT_DOWN = _Name("Icon", "ARROW_LEFT_DOWN")
+    ARROW_RIGHT_UP = _Name("Icon", "ARROW_RIGHT_UP")
+    ARROW_LEFT_UP = _Name("Icon", "ARROW_LEFT_UP")
+    HAPPY = _Name("Icon", "HAPPY")
+    SAD = _Name("Icon", "SAD")
+    HEART = _Name("Icon", "HEART")
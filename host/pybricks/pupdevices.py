@@ -0,0 +1,71 @@
+"""
+Stand-in for pybricks.pupdevices
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from uerrno import ENODEV
+
+from emulator import emulator, COLOR_LIGHT_MATRIX, FORCE_SENSOR
+from pybricks.parameters import Color
+
+
+def _check_port(port, device_id):
+    if emulator.ports.get(port.name) != device_id:
+        raise OSError(ENODEV)
+
+
+class ColorLightMatrix:
+    """3x3 Color Light Matrix, its pixels are kept in emulator.matrices."""
+
+    def __init__(self, port):
+        _check_port(port, COLOR_LIGHT_MATRIX)
+        self.__port = port.name
+        emulator.matrices[self.__port] = [Color.NONE] * 9
+
+    def on(self, colors):
+        emulator.matrix_writes += 1
+        if isinstance(colors, Color):
+            colors = [colors] * 9
+        if len(colors) != 9:
+            raise ValueError("ColorLightMatrix needs 9 colors")
+        emulator.matrices[self.__port] = list(colors)
+
+    def off(self):
+        emulator.matrix_writes += 1
+        emulator.matrices[self.__port] = [Color.NONE] * 9
+
+
+class ForceSensor:
+    """Force Sensor, the force is taken from the scripted inputs of the emulator."""
+
+    def __init__(self, port):
+        _check_port(port, FORCE_SENSOR)
+        self.__port = port.name
+
+    def force(self):
+        emulator.sensor_reads += 1
+        return emulator.forces.get(self.__port, 0.0)
+
+    def distance(self):
+        return 8.0 - min(self.force(), 10.0) * 0.8
+
+    def pressed(self, force=3):
+        return self.force() >= force
+
+    def touched(self):
+        return self.force() > 0
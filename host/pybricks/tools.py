@@ -0,0 +1,55 @@
+"""
+Stand-in for pybricks.tools, based on the virtual clock of the emulated hub
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from emulator import emulator
+
+
+def wait(time):
+    """Lets the given time in ms pass on the virtual clock."""
+    emulator.waits += 1
+    for listener in emulator.wait_listeners:
+        listener(emulator)
+    emulator.advance(time)
+
+
+class StopWatch:
+    """Stop watch on the virtual clock."""
+
+    def __init__(self):
+        self.__start = emulator.now
+        self.__paused = None
+
+    def time(self):
+        if self.__paused is not None:
+            return self.__paused
+        return emulator.now - self.__start
+
+    def reset(self):
+        self.__start = emulator.now
+        if self.__paused is not None:
+            self.__paused = 0
+
+    def pause(self):
+        self.__paused = self.time()
+
+    def resume(self):
+        if self.__paused is not None:
+            self.__start = emulator.now - self.__paused
+            self.__paused = None
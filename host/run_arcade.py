@@ -0,0 +1,154 @@
+"""
+Runs the PortaBrick Arcade or one of its games on the emulated hub
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Usage: python host/run_arcade.py [main|snake|pong] [--script FILE] [--seed N] [--time-limit MS] [--size WxH]
+                                 [--show WxH] [--record] [--replay FILE]
+
+--size runs the arcade on a display of another resolution, the emulated hub gets the matrices for it on the first
+ports and the two force sensors on the ports after them (e.g. 12x12: matrices on A to P, force sensors on Q and R).
+
+--record prints the input log of every game round when it ends, --replay plays the round of a log again instead of
+reading the game controllers (the file holds the printed REPLAY_INPUT line or just the text in its quotes). A replay
+reproduces the round exactly, whatever the timing of the run.
+
+A script file holds one input per line: time in ms, target and value, e.g.
+    1000 CENTER 1       # press the hub's center button
+    1100 CENTER 0       # release it
+    5000 E 4.5          # push the force sensor on port E with 4.5 N
+Lines starting with # are ignored.
+"""
+
+import os
+import runpy
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(HOST_DIR)
+
+# The stand-ins must be found before anything else, the arcade's modules next
+for path in (REPO_DIR, HOST_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from emulator import emulator, ports_for  # noqa: E402
+import arcade_services  # noqa: E402
+import input_log  # noqa: E402
+
+# Resolution the arcade is configured for, used unless a run asks for another one
+DEFAULT_RESOLUTION = arcade_services.DISPLAY_RESOLUTION
+
+PROGRAMS = {
+    "main": "main.py",
+    "snake": "brick_snake.py",
+    "pong": "brick_pong.py",
+}
+
+
+def read_script(filename):
+    """ Reads a script file.
+    :param filename: name of the file
+    :return: list of script entries (time, target, value)
+    """
+    script = []
+    with open(filename) as file:
+        for line in file:
+            line = line.split("#")[0].strip()
+            if not line:
+                continue
+            time, target, value = line.split()
+            script.append((int(time), target, float(value)))
+    return script
+
+
+def read_replay(filename):
+    """ Reads a log printed by a recorded round.
+    :param filename: name of the file
+    :return: replay text of the log
+    """
+    with open(filename) as file:
+        text = file.read()
+    if '"' in text:
+        text = text.split('"')[1]
+    return text.strip()
+
+
+def run(program="main", script=(), seed=0, time_limit=600000, ports=None, listeners=(), wait_listeners=(),
+        resolution=None, record=False, replay=None):
+    """ Runs a program of the arcade unmodified on the emulated hub until it ends or is stopped.
+    :param program: "main", "snake" or "pong"
+    :param script: scripted inputs, see Emulator.configure()
+    :param seed: seed of the random generator
+    :param time_limit: virtual time in ms after which the program is stopped
+    :param ports: devices on the ports, see Emulator.configure(), defaults to matrices for the resolution followed
+                  by two force sensors
+    :param listeners: functions called whenever virtual time passes, e.g. to steer a game
+    :param wait_listeners: functions called at every wait(), e.g. to measure the frames
+    :param resolution: (x, y) resolution of the display, defaults to DISPLAY_RESOLUTION of arcade_services
+    :param record: True prints the input log of every game round
+    :param replay: replay text of a logged round, played instead of reading the game controllers
+    :return: the emulator after the run
+    """
+    resolution = DEFAULT_RESOLUTION if resolution is None else tuple(resolution)
+    if ports is None:
+        ports = ports_for(resolution[0], resolution[1])
+    arcade_services.DISPLAY_RESOLUTION = resolution  # the programs read it when they start
+    input_log.RECORD_INPUT = record
+    input_log.REPLAY_INPUT = replay
+    emulator.configure(ports=ports, script=script, seed=seed, time_limit=time_limit)
+    emulator.listeners.extend(listeners)
+    emulator.wait_listeners.extend(wait_listeners)
+    try:
+        runpy.run_path(os.path.join(REPO_DIR, PROGRAMS[program]), run_name="__main__")
+    except SystemExit:
+        pass
+    return emulator
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"program": "main", "script": (), "seed": 0, "time_limit": 600000}
+    show = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--script":
+            options["script"] = read_script(args.pop(0))
+        elif arg == "--seed":
+            options["seed"] = int(args.pop(0))
+        elif arg == "--time-limit":
+            options["time_limit"] = int(args.pop(0))
+        elif arg == "--size":
+            options["resolution"] = [int(value) for value in args.pop(0).split("x")]
+        elif arg == "--record":
+            options["record"] = True
+        elif arg == "--replay":
+            options["replay"] = read_replay(args.pop(0))
+        elif arg == "--show":
+            show = [int(value) for value in args.pop(0).split("x")]
+        elif arg in PROGRAMS:
+            options["program"] = arg
+        else:
+            print(__doc__)
+            sys.exit(2)
+
+    result = run(**options)
+    if show:
+        print(result.render(show[0], show[1]))
+    print("Virtual time:", result.now, "ms")
+    print("Matrix writes:", result.matrix_writes)
+    print("Hub display writes:", result.hub_display_writes)
+    print("Force sensor reads:", result.sensor_reads)
@@ -0,0 +1,46 @@
+"""
+Stand-in for the MicroPython module urandom, seeded by the emulated hub
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from emulator import emulator
+
+
+def seed(value):
+    emulator.random.seed(value)
+    emulator.seed = value
+
+
+def randint(a, b):
+    return emulator.random.randint(a, b)
+
+
+def randrange(start, stop=None, step=1):
+    return emulator.random.randrange(start, stop, step)
+
+
+def choice(sequence):
+    return emulator.random.choice(sequence)
+
+
+def random():
+    return emulator.random.random()
+
+
+def getrandbits(bits):
+    return emulator.random.getrandbits(bits)
@@ -0,0 +1,153 @@
+"""
+Class HubDisplay used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.tools import StopWatch
+
+from hub_input import PRESS
+
+# Time in ms between two updates of a scrolling text while a menu waits for buttons
+SCROLL_PERIOD = 50
+
+
+class HubDisplay:
+    """ Wraps the 5x5 display of the hub and remembers what it shows. number(), char() and icon() write to the
+        display only if the content changes, so a score can be shown on every tick for free.
+        Besides the blocking text() it scrolls text without blocking: scroll() starts the text, update() shows
+        the character due at the moment and has to be called regularly, e.g. by task() in a Scheduler or from a
+        menu loop. hold() waits for a scroll like text() does, but a press of a hub button ends it early.
+
+        Input needed:
+        - display: the display of the LEGO Spike Prime Hub (hub.display)
+
+        Readable from outside:
+        - writes (integer): number of writes that reached the display
+    """
+
+    def __init__(self, display):
+        self.__display = display
+        self.__shown = None         # content on the display, None if unknown or dark
+        self.__text = None          # text being scrolled, None if no scroll is running
+        self.__index = 0            # position of the next step of the scroll
+        self.__on = 0               # time in ms a character is shown
+        self.__off = 0              # time in ms between two characters
+        self.__next = 0             # time of the next step of the scroll
+        self.__clock = StopWatch()
+        self.writes = 0
+
+    def __show(self, content):
+        """Remembers the content, returns False if it is already shown."""
+        if content == self.__shown:
+            return False
+        self.__shown = content
+        self.writes += 1
+        return True
+
+    def number(self, number):
+        self.__text = None
+        if self.__show(("number", number)):
+            self.__display.number(number)
+
+    def char(self, char):
+        self.__text = None
+        if self.__show(("char", char)):
+            self.__display.char(char)
+
+    def icon(self, icon):
+        self.__text = None
+        if self.__show(("icon", icon)):
+            self.__display.icon(icon)
+
+    def off(self):
+        self.__text = None
+        if self.__show(None):
+            self.__display.off()
+
+    def text(self, text, on=500, off=50):
+        """Scrolls the text and blocks until it is done, like hub.display.text()."""
+        self.__text = None
+        self.__shown = ("text", text)  # the display ends in an unknown state, the next write always passes
+        self.writes += 1
+        self.__display.text(text, on, off)
+
+    def scroll(self, text, on=500, off=50):
+        """ Starts to scroll the text without blocking. Starting the text already scrolling changes nothing.
+        :param text: text to scroll
+        :param on: time in ms a character is shown
+        :param off: time in ms between two characters
+        :return:
+        """
+        if text == self.__text:
+            return
+        self.__text = text
+        self.__index = 0
+        self.__on = on
+        self.__off = off
+        self.__next = self.__clock.time()
+        self.update()
+
+    def scrolling(self):
+        """Returns True while a text started by scroll() is not finished yet."""
+        return self.__text is not None
+
+    def update(self):
+        """ Shows the next character of the scrolled text if it is due. Every character is shown for 'on' ms,
+        followed by a dark display for 'off' ms.
+        :return:
+        """
+        if self.__text is None or self.__clock.time() < self.__next:
+            return
+        step = self.__index
+        self.__index += 1
+        if step >= 2 * len(self.__text):
+            self.__text = None  # done, the display stays dark
+            return
+        if step % 2 == 0:
+            if self.__show(("char", self.__text[step // 2])):
+                self.__display.char(self.__text[step // 2])
+            self.__next += self.__on
+        else:
+            if self.__show(None):
+                self.__display.off()
+            self.__next += self.__off
+
+    def hold(self, hub_input, duration=0):
+        """ Keeps a text started by scroll() going until it is done, then keeps the display as it is for duration
+        ms. A press of any of the hub's buttons ends the wait at once, the rest of the text is not shown.
+        :param hub_input: events of the hub's buttons (HubInput)
+        :param duration: time in ms to wait after the text
+        :return: True if a button was pressed
+        """
+        while self.__text is not None:
+            self.update()
+            event = hub_input.next_event(SCROLL_PERIOD)
+            if event is not None and event[0] == PRESS:
+                self.__text = None
+                return True
+        end = self.__clock.time() + duration
+        while self.__clock.time() < end:
+            event = hub_input.next_event(end - self.__clock.time())
+            if event is not None and event[0] == PRESS:
+                return True
+        return False
+
+    def task(self):
+        while True:
+            self.update()
+            yield
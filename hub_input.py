@@ -0,0 +1,102 @@
+"""
+Class HubInput used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.parameters import Button
+from pybricks.tools import wait, StopWatch
+
+# Kinds of button events
+PRESS = 1
+RELEASE = 2
+REPEAT = 3
+
+
+class HubInput:
+    """ Turns the hub's buttons into events. The buttons are sampled at a fixed rate, every change of a button
+        is reported once as PRESS or RELEASE event, a button held down is reported as REPEAT event. Menus block on
+        next_event(), which sleeps between the samples instead of polling the buttons in a tight loop.
+
+        Input needed:
+        - hub: the LEGO Spike Prime Hub
+        - sample_period (integer): time between two samples in ms
+        - debounce (integer): time in ms a button is locked after a change, bouncing within is ignored
+        - repeat_delay (integer): time in ms a button must be held until the first REPEAT event
+        - repeat_period (integer): time in ms between two REPEAT events
+
+        Events are tuples (kind, button), e.g. (PRESS, Button.CENTER).
+    """
+
+    def __init__(self, hub, sample_period=20, debounce=60, repeat_delay=500, repeat_period=250):
+        self.__hub = hub
+        self.__sample_period = sample_period
+        self.__debounce = debounce
+        self.__repeat_delay = repeat_delay
+        self.__repeat_period = repeat_period
+
+        self.__buttons = (Button.LEFT, Button.RIGHT, Button.CENTER, Button.BLUETOOTH)
+        self.__held = [False, False, False, False]      # debounced state of each button
+        self.__changed = [0, 0, 0, 0]                   # time of last change of each button
+        self.__repeat = [0, 0, 0, 0]                    # time of next REPEAT event of each button
+        self.__events = []                              # events not yet fetched
+        self.__clock = StopWatch()
+
+    def sample(self):
+        """ Reads the buttons once and queues the events resulting from it.
+        :return:
+        """
+        pressed = self.__hub.buttons.pressed()
+        now = self.__clock.time()
+        for i in range(len(self.__buttons)):
+            button = self.__buttons[i]
+            down = button in pressed
+            if down != self.__held[i]:
+                if now - self.__changed[i] < self.__debounce:
+                    continue  # still bouncing
+                self.__held[i] = down
+                self.__changed[i] = now
+                if down:
+                    self.__events.append((PRESS, button))
+                    self.__repeat[i] = now + self.__repeat_delay
+                else:
+                    self.__events.append((RELEASE, button))
+            elif down and now >= self.__repeat[i]:
+                self.__events.append((REPEAT, button))
+                self.__repeat[i] = now + self.__repeat_period
+
+    def next_event(self, timeout=None):
+        """ Waits for the next event, sleeping between the samples.
+        :param timeout: maximum time to wait in ms, None waits endlessly
+        :return: event as tuple (kind, button) or None if the timeout elapsed
+        """
+        start = self.__clock.time()
+        while not self.__events:
+            self.sample()
+            if self.__events:
+                break
+            if timeout is not None and self.__clock.time() - start >= timeout:
+                return None
+            wait(self.__sample_period)
+        return self.__events.pop(0)
+
+    def clear(self):
+        """ Drops all pending events. Buttons still held down count as already pressed and create no new PRESS.
+        :return:
+        """
+        self.sample()
+        self.__events.clear()
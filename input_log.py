@@ -0,0 +1,174 @@
+"""
+Class InputLog used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import urandom
+
+# Set to True to record every game round and print the log when the round ends
+RECORD_INPUT = False
+
+# Paste a printed log here (the text in quotes) to replay that round instead of reading the controllers
+REPLAY_INPUT = None
+
+# Number of ticks the log holds, at 100 ms per tick 3000 ticks are five minutes
+LOG_CAPACITY = 3000
+
+
+class InputLog:
+    """ Records the input of a game round and replays it exactly. Per tick of the game one byte is logged: the
+        levels of both game controllers (bits 0-1 left, bits 2-3 right) and the number of simulation steps the
+        GameClock did in that tick (bits 4-7). Together with the seed of the random generator and the game settings
+        this reproduces the whole round, independent of timing.
+
+        The bytes are kept in a ring buffer, allocated by the first recorded round or sized to the replayed log, so
+        the log takes no memory while it is switched off. A round longer than the capacity keeps only its last
+        ticks and cannot be replayed anymore. print_log() writes the log to stdout as one line of text, which can be
+        given back as replay text.
+
+        Input needed:
+        - record (boolean): True records every round, defaults to RECORD_INPUT
+        - replay (string): log to replay, defaults to REPLAY_INPUT
+        - capacity (integer): number of ticks the ring buffer holds
+
+        Readable from outside:
+        - record_enabled (boolean): True if every round is recorded
+        - replay_enabled (boolean): True if a log to replay is given, every round replays it
+        - recording (boolean): True while a round is recorded
+        - replaying (boolean): True while a round is replayed, False as soon as the log is used up
+        - seed (integer): seed of the random generator of the round
+        - settings (tuple): hard game and game speed of the round as chosen in GameControl, None if unknown
+    """
+
+    def __init__(self, record=None, replay=None, capacity=LOG_CAPACITY):
+        self.record_enabled = RECORD_INPUT if record is None else record
+        self.__capacity = capacity
+        self.__ticks = None     # ring buffer of the ticks, allocated only when needed
+        self.__start = 0        # position of the oldest tick in the ring buffer
+        self.__count = 0        # number of logged ticks
+        self.__position = 0     # number of ticks replayed so far
+        self.__current = -1     # position of the tick steps are added to, -1 before the first tick
+        self.__taken = 0        # number of replayed ticks whose steps are used
+        self.__wrapped = False  # True if the oldest ticks of the round were dropped
+        self.recording = False
+        self.replaying = False
+        self.seed = 0
+        self.settings = None
+
+        replay = REPLAY_INPUT if replay is None else replay
+        self.replay_enabled = replay is not None
+        if self.replay_enabled:
+            self.__parse(replay)
+
+    def __parse(self, text):
+        """Reads a log printed by print_log()."""
+        fields = text.split()
+        self.seed = int(fields[0])
+        self.settings = (fields[1] == "1", int(fields[2]))
+        data = fields[3] if len(fields) > 3 else ""
+        self.__count = len(data) // 2
+        self.__ticks = bytearray(self.__count)
+        for i in range(self.__count):
+            self.__ticks[i] = int(data[2 * i:2 * i + 2], 16)
+
+    def set_settings(self, hardgame, game_speed):
+        """Logs the game settings, called by GameControl when they are chosen."""
+        self.settings = (hardgame, game_speed)
+
+    def start(self):
+        """ Starts a round: seeds the random generator and starts recording or replaying, if switched on.
+        :return:
+        """
+        if self.replay_enabled:
+            self.replaying = True
+            self.__position = 0
+            self.__taken = 0
+        elif self.record_enabled:
+            self.recording = True
+            if self.__ticks is None:
+                self.__ticks = bytearray(self.__capacity)
+            self.seed = urandom.getrandbits(16)
+            self.__start = 0
+            self.__count = 0
+            self.__current = -1
+            self.__wrapped = False
+        else:
+            return
+        urandom.seed(self.seed)
+
+    def stop(self):
+        """ Ends a round, a recorded round is printed.
+        :return:
+        """
+        if self.recording:
+            self.recording = False
+            self.print_log()
+        self.replaying = False
+
+    def tick(self, level_L, level_R):
+        """Logs the levels of the controllers of a new tick, the oldest tick is dropped when the log is full."""
+        size = len(self.__ticks)
+        if self.__count < size:
+            self.__current = (self.__start + self.__count) % size
+            self.__count += 1
+        else:
+            self.__current = self.__start
+            self.__start = (self.__start + 1) % size
+            self.__wrapped = True
+        self.__ticks[self.__current] = level_L | level_R << 2
+
+    def add_steps(self, count):
+        """Logs simulation steps done by the GameClock in the current tick."""
+        if self.__current < 0:
+            return
+        steps = min((self.__ticks[self.__current] >> 4) + count, 15)
+        self.__ticks[self.__current] = self.__ticks[self.__current] & 0x0F | steps << 4
+
+    def next_tick(self):
+        """ Returns the levels of the controllers of the next replayed tick.
+        :return: (level_L, level_R), None when the log is used up and the replay is over
+        """
+        if self.__position >= self.__count:
+            self.replaying = False
+            return None
+        entry = self.__ticks[self.__position]
+        self.__position += 1
+        return entry & 0x03, entry >> 2 & 0x03
+
+    def take_steps(self):
+        """Returns the simulation steps of all replayed ticks whose steps are not used yet."""
+        count = 0
+        for i in range(self.__taken, self.__position):
+            count += self.__ticks[i] >> 4
+        self.__taken = self.__position
+        return count
+
+    def print_log(self):
+        """ Prints the log as replay text: seed, hard game, game speed and the ticks in hex.
+        :return:
+        """
+        size = len(self.__ticks)
+        if self.__wrapped:
+            print("Input log: the round was longer than", size, "ticks, only the end is kept, no replay possible")
+        settings = self.settings if self.settings is not None else (False, 0)
+        print("Input log:", self.__count, "ticks")
+        print('REPLAY_INPUT = "', end="")
+        print(self.seed, 1 if settings[0] else 0, settings[1], end=" ")
+        for i in range(self.__count):
+            print("%02x" % self.__ticks[(self.__start + i) % size], end="")
+        print('"')
@@ -17,17 +17,30 @@ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER I
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
-from pybricks.hubs import PrimeHub
+import gc
+import sys
+
 from pybricks.parameters import Icon, Button, Color
-from pybricks.tools import wait
 
-# Import helper files (ColorMatrixDisplay driver, pixel library)
-from matrix_helper import MatrixHelper
-from pixel_library import PixelLibrary
+# Import shared hardware and helpers (hub, ColorMatrixDisplay driver, pixel library, game controllers)
+from animation import Animation
+from arcade_services import ArcadeServices, DISPLAY_RESOLUTION
+from hub_display import SCROLL_PERIOD
+from hub_input import PRESS, REPEAT
+
+# Registry of available games (Add additional games here). A game's module is only imported and the game only
+# initialized when it is chosen in the menu, afterwards both are released again.
+# Entry: (name, icon in pixel library, color of icon, module, class)
+GAME_NAME = 0
+GAME_ICON = 1
+GAME_COLOR = 2
+GAME_MODULE = 3
+GAME_CLASS = 4
 
-# Import games (Add additional games here and initialize them in "__init__" section)
-from brick_pong import BrickPong
-from brick_snake import BrickSnake
+AVAILABLE_GAMES = (
+    ("Snake", "snake", Color.ORANGE, "brick_snake", "BrickSnake"),
+    ("Pong", "pong", Color.BLUE, "brick_pong", "BrickPong"),
+)
 
 
 class PortaBrickArcade:
@@ -36,32 +49,59 @@ class PortaBrickArcade:
 
     def __init__(self):
         # Basic variables
-        self.display_resolution = (6, 6)
+        self.display_resolution = DISPLAY_RESOLUTION
         self.pressed = []
 
-        # Load available games (Must be initialized AND added to "available_games" dictionary!!!)
-        self.snake_game = BrickSnake(self.display_resolution[0], self.display_resolution[1])
-        self.pong_game = BrickPong(self.display_resolution[0], self.display_resolution[1])
-        self.available_games = (self.snake_game, self.pong_game)
-
-        # Initialize classes and Hardware
-        self.hub = PrimeHub()
-        self.matrix = MatrixHelper(self.display_resolution[0], self.display_resolution[1])
-        self.pixel_lib = PixelLibrary()
+        # Initialize classes and Hardware once, they are shared with all games
+        self.services = ArcadeServices(self.display_resolution[0], self.display_resolution[1])
+        self.hub = self.services.hub
+        self.display = self.services.display
+        self.matrix = self.services.matrix
+        self.pixel_lib = self.services.pixel_lib
+        self.pic_offset = self.services.pic_offset  # position of pixel graphics centered on the display
+        self.hub_input = self.services.hub_input
+
+        # Descriptors of available games, the games themselves are loaded on demand
+        self.available_games = AVAILABLE_GAMES
+
+        # Colors of the menu, declared once in the display's palette
+        self.color_heart = self.matrix.palette.add("heart", Color.RED)
+        self.color_heart_beat = self.matrix.palette.add("heart_beat", Color(h=0, s=100, v=40))
+        self.menu_colors = []  # palette index of each game's icon
+        for entry in self.available_games:
+            self.menu_colors.append(self.matrix.palette.add(entry[GAME_NAME], entry[GAME_COLOR]))
 
         # Change functions of hub's buttons
         self.hub.system.set_stop_button(None)  # Disable Center button to be used as return button
         self.hub.system.set_stop_button(Button.BLUETOOTH)  # Set Bluetooth button as stop button for system
 
     def start_up(self):
-        self.matrix.draw_pixel_graphic(self.pixel_lib.pixelpics("heart"), Color.RED)
-        self.hub.display.text("PortaBrick Arcade", 200, 50)
+        # The heart beats while the title scrolls on the hub, any button skips the intro
+        heart = self.pixel_lib.pixelpics("heart")
+        self.display.scroll("PortaBrick Arcade", 200, 50)
+        Animation(self.matrix, ((heart, self.color_heart, 500), (heart, self.color_heart_beat, 250)),
+                  loop=True, offset=self.pic_offset).play(self.hub_input, self.display)
+        self.display.off()
         self.matrix.matrix_off()
-        wait(1000)
 
     def end_session(self):
         self.matrix.matrix_off()
-        self.hub.display.off()
+        self.display.off()
+
+    def launch_game(self, entry):
+        """ Imports and initializes the given game, plays it and releases it afterwards to free the heap.
+        :param entry: descriptor of the game from the registry
+        :return:
+        """
+        module = __import__(entry[GAME_MODULE])
+        game = getattr(module, entry[GAME_CLASS])(self.services)
+        game.gameplay()
+
+        # Release the game and its module, so the next game finds the heap as free as possible
+        del game
+        del module
+        del sys.modules[entry[GAME_MODULE]]
+        gc.collect()
 
     def dialog(self):
         counter = 0         # Counter for menu entries
@@ -69,45 +109,49 @@ class PortaBrickArcade:
         sys_quit = False    # True closes program
 
         def show_menu_entry(i):
-            self.matrix.matrix_off()
-            self.matrix.draw_pixel_graphic(self.pixel_lib.pixelpics(self.available_games[i].app_icon),
-                                           self.available_games[i].app_color)
-            self.hub.display.text(self.available_games[i].app_name, 200, 50)
-
-        # Show little Howto how to choose the entries
-        self.hub.display.text("Choose game", 200, 100)
-        wait(500)
-        self.hub.display.text("Next", 200, 100)
-        wait(500)
-        self.hub.display.icon(Icon.ARROW_RIGHT_DOWN)
-        wait(1000)
-        self.hub.display.text("Previous", 200, 100)
-        wait(500)
-        self.hub.display.icon(Icon.ARROW_LEFT_DOWN)
-        wait(1000)
-        self.hub.display.text("Quit", 200, 100)
-        wait(500)
-        self.hub.display.icon(Icon.ARROW_RIGHT_UP)
-        wait(1000)
+            # Compose the whole icon in the framebuffer, then write only the modules that differ from the last one
+            self.matrix.clear()
+            self.matrix.blit_points(self.pixel_lib.pixelpics(self.available_games[i][GAME_ICON]),
+                                    self.menu_colors[i], self.pic_offset[0], self.pic_offset[1])
+            self.matrix.commit()
+            self.display.scroll(self.available_games[i][GAME_NAME], 200, 50)
+
+        # Show little Howto how to choose the entries, any button skips the rest of it
+        howto = (("Choose game", None), ("Next", Icon.ARROW_RIGHT_DOWN), ("Previous", Icon.ARROW_LEFT_DOWN),
+                 ("Quit", Icon.ARROW_RIGHT_UP))
+        self.hub_input.clear()
+        for text, icon in howto:
+            self.display.scroll(text, 200, 100)
+            if self.display.hold(self.hub_input, 500):
+                break
+            if icon is not None:
+                self.display.icon(icon)
+                if self.display.hold(self.hub_input, 1000):
+                    break
 
         while not sys_quit:
             # Show the first menu entry
             show_menu_entry(counter)
 
+            self.hub_input.clear()
             while not action:
-                pressed = self.hub.buttons.pressed()
-                if Button.LEFT in pressed:
+                # Sleeps until a button event arrives, wakes up in between while the name of the game scrolls
+                self.display.update()
+                event = self.hub_input.next_event(SCROLL_PERIOD if self.display.scrolling() else None)
+                if event is None or (event[0] != PRESS and event[0] != REPEAT):
+                    continue
+                if event[1] == Button.LEFT:
                     if counter > 0:
                         counter -= 1
                         show_menu_entry(counter)
-                elif Button.RIGHT in pressed:
+                elif event[1] == Button.RIGHT:
                     if counter < len(self.available_games) - 1:
                         counter += 1
                         show_menu_entry(counter)
-                elif Button.CENTER in pressed:
-                    self.available_games[counter].gameplay()
+                elif event[1] == Button.CENTER and event[0] == PRESS:
+                    self.launch_game(self.available_games[counter])
                     action = True
-                elif Button.BLUETOOTH in pressed:
+                elif event[1] == Button.BLUETOOTH:
                     self.end_session()
             action = False
 
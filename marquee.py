@@ -0,0 +1,102 @@
+"""
+Class Marquee used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pixel_library import PixelLibrary, PIC_RES_Y
+
+
+class Marquee:
+    """ Scrolls a text from right to left over the color matrix. The text is converted once into a bitmap with one
+        entry per column, bit y of an entry is set if pixel y of the column is on. Each step shifts the visible
+        window by one column and draws only the columns whose state changed with blit_columns(), so a commit pushes
+        only the modules that changed.
+
+        Input needed:
+        - matrix: driver of the display (MatrixHelper in buffered mode)
+        - res_x, res_y (integer): resolution of the display in pixel
+        - text (string): text to scroll, characters must be in the PixelLibrary
+        - color (integer): palette index of the color of the text
+        - speed (integer): time in ms between two steps, used as period for the Scheduler
+        - gap (integer): empty columns between two characters
+
+        Readable from outside:
+        - speed (integer): time in ms between two steps
+    """
+
+    def __init__(self, matrix, res_x, res_y, text, color, speed=150, gap=0):
+        self.__matrix = matrix
+        self.__res_x = res_x
+        self.__color = color
+        self.speed = speed
+
+        # Text is centered vertically, rows outside of the display are clipped
+        self.__top = (res_y - PIC_RES_Y) // 2
+
+        # Precompute the bitmap: the text starts right of the display and leaves it completely before it repeats
+        columns = bytearray(res_x)
+        for char in text:
+            columns.extend(bytes(PixelLibrary.charactercolumns(char)))
+            columns.extend(bytes(gap))
+        self.__columns = columns
+        self.__offset = 0  # first column of the bitmap that is shown on the display
+        self.__shown = bytearray(res_x)  # columns as shown on the display
+        self.__column = bytearray(1)  # changed column handed to blit_columns(), reused for every column
+
+    def reset(self):
+        """ Lets the text start again from the right and forgets what is shown.
+        :return:
+        """
+        self.__offset = 0
+        for x in range(self.__res_x):
+            self.__shown[x] = 0
+
+    def step(self):
+        """ Shifts the text by one column and draws the changed columns.
+        :return:
+        """
+        length = len(self.__columns)
+        self.__offset = (self.__offset + 1) % length
+        for x in range(self.__res_x):
+            column = self.__columns[(self.__offset + x) % length]
+            if column != self.__shown[x]:
+                self.__column[0] = column
+                self.__matrix.blit_columns(self.__column, PIC_RES_Y, self.__color, x, self.__top)
+                self.__shown[x] = column
+        self.__matrix.commit()
+
+    def task(self):
+        """ Generator task for the Scheduler, add it with the marquee's speed as period.
+        :return:
+        """
+        while True:
+            self.step()
+            yield
+
+
+if __name__ == "__main__":
+    from pybricks.parameters import Color
+    from matrix_helper import MatrixHelper
+    from scheduler import Scheduler
+
+    display = MatrixHelper(6, 6, buffered=True)
+    ticker = Marquee(display, 6, 6, "PortaBrick Arcade", display.palette.add("marquee", Color.ORANGE))
+    tasks = Scheduler()
+    tasks.add(ticker.task(), ticker.speed)
+    tasks.run(lambda: tasks.ticks > 200)
+    display.matrix_off()
@@ -23,6 +23,7 @@ from pybricks.pupdevices import ColorLightMatrix
 from pybricks.tools import wait
 
 from detect_devices import DetectDevices
+from palette import Palette, OFF
 
 
 class ResolutionException(Exception):
@@ -34,23 +35,35 @@ class MatrixHelper:
     """
     The MatrixHelper class controls the overall matrix consisting of 3x3 individual matrices.
     The number of matrices is freely selectable and is determined by the desired resolution.
+    Pixels are drawn with the index of a color in the palette (see Palette), declare colors with palette.add().
+
+    Drawing goes to the back buffer, the front buffer holds what the hardware shows. commit() compares both for
+    every module touched since the last commit and writes only modules whose nine slots differ, so a frame that
+    is drawn again the same way costs no device write.
+
+    Readable from outside:
+    - palette: colors of the display (Palette)
+    - modules_sent (integer): number of module writes done by commit()
+    - modules_skipped (integer): number of touched modules commit() did not write, as they showed no change
+    - device_constructions (integer): number of constructed ColorLightMatrix objects
     """
     __res_x = None
     __res_y = None
 
-    def __init__(self, game_res_x, game_res_y):
-        self.__matrix_id = None
-        self.__new_y = None
-        self.__new_x = None
+    def __init__(self, game_res_x, game_res_y, buffered=False, devices=None):
         self.__res_x = game_res_x
         self.__res_y = game_res_y
-        self.__pix_color = None
+        self.__buffered = buffered  # If True pixels are only drawn into the framebuffer until commit() is called
 
-        detect_devices = DetectDevices()
+        # Reuse a given port scan, scan the ports only if none is given
+        if devices is None:
+            devices = DetectDevices()
 
-        self.__matrix_available = detect_devices.matrix_available
-        self.__matrix_ports = detect_devices.matrix_ports
-        self.__matrix_count = int(self.__calc_matrix_count())
+        self.__matrix_available = devices.matrix_available
+        self.__matrix_ports = devices.matrix_ports
+        self.__matrix_count = self.__calc_matrix_count()
+        self.__matrices = []              # Device handles of the modules, opened once and reused for every frame
+        self.device_constructions = 0     # Counts constructed ColorLightMatrix objects, must not grow while playing
 
         # Check if available matrix modules fit to given resolution
         try:
@@ -75,61 +88,172 @@ class MatrixHelper:
                                               'Must not be 0 and must be a multiple of 3.')
             raise
 
-        self.__pixels = []        # Empty list, will hold the lists of each module
-        # self.pix_black = [[Color.NONE, Color.NONE, Color.NONE],
-        #                   [Color.NONE, Color.NONE, Color.NONE],
-        #                   [Color.NONE, Color.NONE, Color.NONE]]      # List with color info to turn module dark
+        # Open every module once, all further drawing reuses these handles
+        for i in range(self.__matrix_count):
+            self.__matrices.append(ColorLightMatrix(self.__matrix_ports[i]))
+            self.device_constructions += 1
+
+        self.palette = Palette()  # colors of the display, the framebuffers hold their indices
+        self.__pixels = []        # Back buffer: palette indices of each module, 9 bytes linewise
+        self.__front = []         # Front buffer: palette indices of each module as shown on the hardware
+        self.__colors = []        # Colors of each module, 9 entries linewise, handed to the hardware as they are
+        self.__dirty = []         # One flag per module, True if module was drawn to since the last commit
+        self.modules_sent = 0
+        self.modules_skipped = 0
 
-        # Pre-set all pixels black (aka off), first initialize nested list
+        # Pre-set all pixels black (aka off)
         for i in range(self.__matrix_count):
-            # here each module get's its still empty pixel list linewise
-            self.__pixels.append([[], [], []])
-            # now fill the emty lists with default entries for black
-            # self.pixels.append(self.pix_black.copy())
-            # self.pixels.append(list(self.pix_black))
-        self.matrix_off()
+            self.__pixels.append(bytearray(9))
+            self.__front.append(bytearray(9))
+            self.__colors.append([Color.NONE] * 9)
+            self.__dirty.append(False)
 
-    def __recalc_coordinates(self, abs_x, abs_y):
-        """Converts a coordinate of the given resolution to the coordinates of a
-        single matrix of the display composed of matrix modules."""
-        self.__new_x = abs_x % 3
-        self.__new_y = abs_y % 3
-        self.__matrix_id = (abs_y // 3 * self.__res_x / 3) + abs_x // 3
-        return self.__new_x, self.__new_y, int(self.__matrix_id)
+        # Lookup table: module and slot within the module of every cell (y * res_x + x) of the display
+        self.__cell_module = bytearray(self.__res_x * self.__res_y)
+        self.__cell_slot = bytearray(self.__res_x * self.__res_y)
+        for y in range(self.__res_y):
+            for x in range(self.__res_x):
+                self.__cell_module[y * self.__res_x + x] = y // 3 * (self.__res_x // 3) + x // 3
+                self.__cell_slot[y * self.__res_x + x] = y % 3 * 3 + x % 3
+        self.matrix_off()
 
     def __calc_matrix_count(self):
         """Calculates the necessary number of individual modules from the given total resolution."""
-        return (self.__res_x / 3) * (self.__res_y / 3)
+        return (self.__res_x // 3) * (self.__res_y // 3)
 
-    def __matrix2pixel(self, index):
-        """Converts the given 'array' to a list"""
-        dot = []
-        for y in range(3):
-            for x in range(3):
-                dot.append(self.__pixels[index][y][x])
-        return dot
+    def __put(self, cell, input_color):
+        """Writes a palette index into the back buffer and marks the module as dirty if the pixel changed.
+        Returns the module of the cell."""
+        module = self.__cell_module[cell]
+        slot = self.__cell_slot[cell]
+        if self.__pixels[module][slot] != input_color:
+            self.__pixels[module][slot] = input_color
+            self.__colors[module][slot] = self.palette.colors[input_color]
+            self.__dirty[module] = True
+        return module
+
+    def __set_pixel(self, input_x, input_y, input_color):
+        """Writes a palette index into the back buffer. In unbuffered mode the module is pushed to the hardware at
+        once, in buffered mode it is only marked as dirty and pushed by the next commit()."""
+        module = self.__put(input_y * self.__res_x + input_x, input_color)
+        if not self.__buffered and self.__dirty[module]:
+            self.__push(module)
 
     def pixel_on(self, input_x, input_y, input_color):
-        temp = self.__recalc_coordinates(input_x, input_y)
-        self.__pixels[temp[2]][temp[1]][temp[0]] = input_color
-        ColorLightMatrix(self.__matrix_ports[temp[2]]).on(self.__matrix2pixel(temp[2]))
+        """Switches a pixel on, input_color is the index of the color in the palette."""
+        self.__set_pixel(input_x, input_y, input_color)
 
     def pixel_off(self, input_x, input_y):
-        temp = self.__recalc_coordinates(input_x, input_y)
-        self.__pixels[temp[2]][temp[1]][temp[0]] = Color.NONE
-        ColorLightMatrix(self.__matrix_ports[temp[2]]).on(self.__matrix2pixel(temp[2]))
+        self.__set_pixel(input_x, input_y, OFF)
+
+    def __push(self, module):
+        """Writes a module to the hardware if its back buffer differs from the front buffer."""
+        self.__dirty[module] = False
+        if self.__pixels[module] == self.__front[module]:
+            self.modules_skipped += 1
+            return
+        self.__matrices[module].on(self.__colors[module])
+        self.__front[module][:] = self.__pixels[module]
+        self.modules_sent += 1
 
-    def draw_pixel_graphic(self, picture, color):
-        for i in range(len(picture)):
-            self.pixel_on(picture[i][0], picture[i][1], color)
+    def commit(self):
+        """Pushes every module that changed since the last commit to the hardware, each at most once.
+        Only needed in buffered mode, in unbuffered mode there is nothing left to push."""
+        for i in range(self.__matrix_count):
+            if self.__dirty[i]:
+                self.__push(i)
+
+    def blit_points(self, points, color, offset_x=0, offset_y=0):
+        """ Draws a pixel graphic given as coordinates, e.g. from the PixelLibrary. Pixels outside the display are
+        clipped. In unbuffered mode every affected module is written once at the end.
+        :param points: sequence of (x, y) coordinates
+        :param color: palette index of the color
+        :param offset_x: x-coordinate of the graphic's origin on the display
+        :param offset_y: y-coordinate of the graphic's origin on the display
+        :return:
+        """
+        res_x = self.__res_x
+        res_y = self.__res_y
+        for point in points:
+            x = point[0] + offset_x
+            y = point[1] + offset_y
+            if 0 <= x < res_x and 0 <= y < res_y:
+                self.__put(y * res_x + x, color)
+        if not self.__buffered:
+            self.commit()
+
+    def blit_columns(self, columns, height, color, offset_x=0, offset_y=0):
+        """ Draws a bitmask graphic given column by column, bit y of a column is set if pixel y is on, e.g. the
+        character columns of the PixelLibrary. Set bits are drawn in the color, clear bits switch the pixel off.
+        Pixels outside the display are clipped. In unbuffered mode every affected module is written once at the end.
+        :param columns: sequence of integers, one per column
+        :param height: number of rows of the graphic
+        :param color: palette index of the color
+        :param offset_x: x-coordinate of the graphic's origin on the display
+        :param offset_y: y-coordinate of the graphic's origin on the display
+        :return:
+        """
+        res_x = self.__res_x
+        res_y = self.__res_y
+        for column in range(len(columns)):
+            x = column + offset_x
+            if not 0 <= x < res_x:
+                continue
+            bits = columns[column]
+            for row in range(height):
+                y = row + offset_y
+                if 0 <= y < res_y:
+                    self.__put(y * res_x + x, color if bits & (1 << row) else OFF)
+        if not self.__buffered:
+            self.commit()
+
+    def blit_buffer(self, buffer, width, offset_x=0, offset_y=0):
+        """ Draws an image given as palette indices row by row, e.g. a bytearray. The whole rectangle is drawn,
+        index OFF switches pixels off. Pixels outside the display are clipped. In unbuffered mode every affected
+        module is written once at the end.
+        :param buffer: sequence of palette indices, width entries per row
+        :param width: width of the image in pixel
+        :param offset_x: x-coordinate of the image's origin on the display
+        :param offset_y: y-coordinate of the image's origin on the display
+        :return:
+        """
+        res_x = self.__res_x
+        res_y = self.__res_y
+        for i in range(len(buffer)):
+            x = i % width + offset_x
+            y = i // width + offset_y
+            if 0 <= x < res_x and 0 <= y < res_y:
+                self.__put(y * res_x + x, buffer[i])
+        if not self.__buffered:
+            self.commit()
+
+    def draw_pixel_graphic(self, picture, color, offset_x=0, offset_y=0):
+        self.blit_points(picture, color, offset_x, offset_y)
+
+    def clear(self):
+        """Switches all pixels off in the back buffer only, the next commit() writes the modules that differ."""
+        for i in range(self.__matrix_count):
+            pixels = self.__pixels[i]
+            colors = self.__colors[i]
+            for slot in range(9):
+                if pixels[slot] != OFF:
+                    pixels[slot] = OFF
+                    colors[slot] = Color.NONE
+                    self.__dirty[i] = True
+        if not self.__buffered:
+            self.commit()
 
     def matrix_off(self):
         for i in range(self.__matrix_count):
-            pix_black = [[Color.NONE, Color.NONE, Color.NONE],
-                         [Color.NONE, Color.NONE, Color.NONE],
-                         [Color.NONE, Color.NONE, Color.NONE]]
-            self.__pixels[i] = pix_black.copy()
-            ColorLightMatrix(self.__matrix_ports[i]).off()
+            pixels = self.__pixels[i]
+            front = self.__front[i]
+            colors = self.__colors[i]
+            for slot in range(9):
+                pixels[slot] = OFF
+                front[slot] = OFF
+                colors[slot] = Color.NONE
+            self.__dirty[i] = False
+            self.__matrices[i].off()
 
 
 if __name__ == "__main__":
@@ -137,10 +261,11 @@ if __name__ == "__main__":
     y_res = 6  # set resolution y
 
     matrix = MatrixHelper(x_res, y_res)
+    red = matrix.palette.add("red", Color.RED)
 
     for y in range(y_res):
         for x in range(x_res):
-            matrix.pixel_on(x, y, Color.RED)
+            matrix.pixel_on(x, y, red)
             wait(150)
 
     for y in range(y_res):
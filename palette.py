@@ -0,0 +1,68 @@
+"""
+Class Palette used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.parameters import Color
+
+# Index of the dark pixel, present in every palette
+OFF = 0
+
+
+class Palette:
+    """ Interned colors of the display. Every color is stored once and addressed by its index, so the framebuffer
+        holds small integers instead of Color objects and drawing creates no new objects. Games declare their colors
+        once by name when they are initialized; declaring a color that is already known returns its index.
+
+        Readable from outside:
+        - colors (list): Color of each index, index OFF is Color.NONE
+    """
+
+    def __init__(self):
+        self.colors = [Color.NONE]
+        self.__names = {"off": OFF}
+
+    def add(self, name, color):
+        """ Declares a named color.
+        :param name: name of the color, e.g. "snake_head"
+        :param color: Color
+        :return: index of the color
+        """
+        index = self.index(color)
+        self.__names[name] = index
+        return index
+
+    def index(self, color):
+        """ Returns the index of the color, an unknown color is added.
+        :param color: Color
+        :return: index of the color
+        """
+        for i in range(len(self.colors)):
+            if self.colors[i] == color:
+                return i
+        if len(self.colors) == 256:
+            raise ValueError("Palette is full, it holds 256 colors")
+        self.colors.append(color)
+        return len(self.colors) - 1
+
+    def get(self, name):
+        """ Returns the index of a color declared before.
+        :param name: name of the color
+        :return: index of the color
+        """
+        return self.__names[name]
@@ -20,87 +20,121 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 """
 
 
+# Resolution the pixel graphics are designed for
+PIC_RES_X = 6
+PIC_RES_Y = 6
+
+# Pixel graphics as coordinates (x, y). Built once at import, lookups return these read-only tuples.
+PIXELPICS = {
+    'smiley': ((0, 0), (1, 0), (0, 1), (1, 1), (4, 0), (5, 0), (4, 1), (5, 1), (0, 3), (1, 4), (2, 4), (3, 4),
+               (4, 4), (5, 3)),
+    'smiley_sad': ((0, 0), (1, 0), (0, 1), (1, 1), (4, 0), (5, 0), (4, 1), (5, 1), (0, 5), (1, 4), (2, 4),
+                   (3, 4), (4, 4), (5, 5)),
+    'heart': ((1, 0), (0, 1), (0, 2), (1, 3), (2, 4), (3, 4), (4, 3), (5, 2), (5, 1), (4, 0), (3, 1), (2, 1),
+              (1, 1), (1, 2), (2, 2), (3, 2), (4, 2), (4, 1), (3, 3), (2, 3), (0, 3), (1, 4), (2, 5), (3, 5),
+              (4, 4), (5, 3)),
+    'pong': ((0, 1), (0, 2), (0, 3), (5, 4), (5, 3), (5, 2), (2, 2)),
+    'snake': ((1, 4), (2, 4), (3, 4), (4, 4), (4, 3), (4, 1))
+}
+
+# Characters as coordinates (x, y). Built once at import, lookups return these read-only tuples.
+CHARACTERS = {
+    'A': ((1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (4, 3), (4, 4), (4, 5), (1, 5), (1, 4), (1, 3), (1, 2),
+          (2, 3), (3, 3)),
+    'B': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (4, 4), (4, 3), (3, 2), (2, 2),
+          (2, 0), (3, 0), (4, 1)),
+    'C': ((4, 1), (3, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 4)),
+    'D': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (4, 4), (4, 3), (2, 0), (3, 0),
+          (4, 1), (4, 2)),
+    'E': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (2, 0), (3, 0), (4, 0), (4, 5),
+          (2, 2), (3, 2)),
+    'F': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 0), (3, 0), (4, 0), (2, 2), (3, 2)),
+    'G': ((4, 1), (3, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 4), (4, 3), (3, 3)),
+    'H': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 2), (3, 2), (4, 0), (4, 1), (4, 2), (4, 3),
+          (4, 4), (4, 5)),
+    'I': ((1, 0), (2, 0), (3, 0), (4, 0), (3, 1), (2, 1), (2, 2), (3, 2), (3, 3), (2, 3), (2, 4), (3, 4),
+          (3, 5), (2, 5), (1, 5), (4, 5)),
+    'J': ((1, 0), (2, 0), (3, 0), (4, 0), (2, 5), (3, 5), (4, 4), (4, 3), (4, 2), (4, 1), (1, 4), (2, 3)),
+    'K': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (4, 0), (3, 1), (2, 2), (3, 3), (4, 4), (4, 5)),
+    'L': ((1, 5), (1, 4), (1, 3), (1, 2), (1, 1), (1, 0), (2, 5), (3, 5), (4, 5), (2, 4), (2, 3), (2, 2),
+          (2, 1), (2, 0)),
+    'M': ((0, 1), (0, 0), (0, 2), (0, 3), (0, 4), (0, 5), (1, 1), (2, 2), (3, 2), (4, 1), (5, 0), (5, 1),
+          (5, 2), (5, 3), (5, 4), (5, 5)),
+    'N': ((0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (5, 0), (5, 1), (5, 2), (5, 3), (5, 4), (5, 5),
+          (4, 4), (3, 3), (2, 2), (1, 1)),
+    'O': ((1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (4, 3), (4, 4), (3, 5), (2, 5), (1, 4), (1, 3), (1, 2)),
+    'P': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 3), (3, 3), (4, 2), (4, 1), (3, 0), (2, 0)),
+    'Q': ((2, 0), (3, 0), (3, 4), (2, 4), (4, 5), (5, 5), (4, 1), (4, 2), (4, 3), (1, 3), (1, 2), (1, 1),
+          (3, 5)),
+    'R': ((1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 3), (4, 2), (4, 1), (3, 0), (2, 0), (3, 3),
+          (3, 4), (4, 5)),
+    'S': ((3, 0), (2, 0), (1, 1), (2, 5), (2, 2), (4, 0), (4, 3), (4, 4), (3, 2), (3, 5), (1, 5)),
+    'T': ((1, 0), (2, 0), (3, 0), (4, 0), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5), (2, 5), (2, 4), (2, 3),
+          (2, 2), (2, 1)),
+    'U': ((1, 1), (1, 0), (1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 4), (4, 3), (4, 2), (4, 1), (4, 0)),
+    'V': ((0, 0), (0, 1), (0, 2), (0, 3), (1, 4), (2, 5), (3, 4), (4, 3), (4, 2), (4, 1), (4, 0)),
+    'W': ((0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 5), (2, 4), (3, 5), (2, 3), (4, 4), (4, 3), (4, 2),
+          (4, 1), (4, 0)),
+    'X': ((1, 0), (1, 1), (1, 4), (1, 5), (3, 5), (3, 4), (3, 1), (3, 0), (2, 2), (2, 3)),
+    'Y': ((0, 0), (0, 1), (1, 2), (2, 4), (2, 5), (3, 2), (4, 1), (4, 0), (2, 3)),
+    'Z': ((1, 0), (2, 0), (3, 0), (4, 0), (4, 5), (3, 5), (2, 5), (1, 5), (1, 4), (2, 3), (3, 2), (4, 1)),
+    '1': ((1, 2), (2, 1), (3, 0), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5)),
+    '2': ((1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (2, 5), (3, 5), (4, 5), (1, 5), (2, 4), (3, 3)),
+    '3': ((1, 5), (2, 5), (3, 5), (4, 4), (4, 3), (3, 2), (2, 2), (4, 1), (3, 0), (2, 0), (1, 0)),
+    '4': ((1, 1), (1, 2), (1, 3), (2, 3), (3, 3), (4, 3), (4, 2), (4, 1), (4, 0), (4, 4), (4, 5), (1, 0)),
+    '5': ((4, 0), (3, 0), (1, 0), (2, 0), (1, 1), (1, 2), (2, 2), (3, 2), (4, 3), (4, 4), (3, 5), (2, 5),
+          (1, 5)),
+    '6': ((3, 0), (1, 4), (2, 5), (3, 5), (4, 4), (1, 1), (2, 0), (4, 3), (2, 2), (3, 2), (1, 3), (4, 0)),
+    '7': ((1, 0), (2, 0), (3, 0), (4, 0), (4, 1), (3, 2), (2, 3), (2, 4), (2, 5)),
+    '8': ((2, 0), (3, 0), (1, 1), (2, 2), (3, 2), (4, 1), (4, 3), (4, 4), (3, 5), (2, 5), (1, 4), (1, 3)),
+    '9': ((1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (3, 3), (2, 3), (1, 2), (4, 4), (4, 3), (4, 5), (3, 5),
+          (2, 5), (1, 5), (4, 0), (1, 0), (1, 3)),
+    '0': ((1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (1, 2), (4, 4), (4, 3), (3, 5), (2, 5), (1, 5), (4, 0),
+          (1, 0), (1, 3), (1, 4), (4, 5), (2, 3), (3, 2)),
+    '.': ((2, 5), (2, 4), (3, 4), (3, 5)),
+    ':': ((2, 5), (2, 4), (3, 4), (3, 5), (2, 1), (2, 2), (3, 2), (3, 1)),
+    '-': ((1, 3), (2, 3), (3, 3), (4, 3)),
+    '_': ((2, 5), (3, 5), (1, 5), (4, 5)),
+    '?': ((1, 1), (2, 0), (3, 0), (4, 1), (2, 3), (2, 5), (3, 2)),
+    '!': ((2, 0), (3, 0), (2, 3), (2, 5), (3, 2), (3, 5), (3, 3), (2, 2), (2, 1), (3, 1)),
+    ' ': ()
+}
+
+
+def _columns(picture):
+    """ Packs a pixel graphic into one bitmask per column, bit y of a column is set if pixel (x, y) is on."""
+    columns = [0] * PIC_RES_X
+    for point in picture:
+        columns[point[0]] |= 1 << point[1]
+    return tuple(columns)
+
+
+CHARACTER_COLUMNS = {}
+for _key in CHARACTERS:
+    CHARACTER_COLUMNS[_key] = _columns(CHARACTERS[_key])
+
+# Lower case letters share the tables of the upper case ones, so lookups need no conversion
+for _key in tuple(CHARACTERS):
+    if _key.lower() != _key:
+        CHARACTERS[_key.lower()] = CHARACTERS[_key]
+        CHARACTER_COLUMNS[_key.lower()] = CHARACTER_COLUMNS[_key]
+del _key
+
+
 class PixelLibrary:
-    def __init__(self):
-        self.__characters_dict = None
-        self.__pixelpics = None
-
-    def pixelpics(self, icon):
-        self.__pixelpics = {
-            'smiley': [(0, 0), (1, 0), (0, 1), (1, 1), (4, 0), (5, 0), (4, 1), (5, 1), (0, 3), (1, 4), (2, 4), (3, 4),
-                       (4, 4), (5, 3)],
-            'smiley_sad': [(0, 0), (1, 0), (0, 1), (1, 1), (4, 0), (5, 0), (4, 1), (5, 1), (0, 5), (1, 4), (2, 4),
-                           (3, 4), (4, 4), (5, 5)],
-            'heart': [(1, 0), (0, 1), (0, 2), (1, 3), (2, 4), (3, 4), (4, 3), (5, 2), (5, 1), (4, 0), (3, 1), (2, 1),
-                      (1, 1), (1, 2), (2, 2), (3, 2), (4, 2), (4, 1), (3, 3), (2, 3), (0, 3), (1, 4), (2, 5), (3, 5),
-                      (4, 4), (5, 3)],
-            'pong': [(0, 1), (0, 2), (0, 3), (5, 4), (5, 3), (5, 2), (2, 2)],
-            'snake': [(1, 4), (2, 4), (3, 4), (4, 4), (4, 3), (4, 1)]
-        }
-
-        return self.__pixelpics[icon]
-
-    def characters(self, char_input):
-        self.__characters_dict = {
-            'A': [(1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (4, 3), (4, 4), (4, 5), (1, 5), (1, 4), (1, 3), (1, 2),
-                  (2, 3), (3, 3)],
-            'B': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (4, 4), (4, 3), (3, 2), (2, 2),
-                  (2, 0), (3, 0), (4, 1)],
-            'C': [(4, 1), (3, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 4)],
-            'D': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (4, 4), (4, 3), (2, 0), (3, 0),
-                  (4, 1), (4, 2)],
-            'E': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (2, 0), (3, 0), (4, 0), (4, 5),
-                  (2, 2), (3, 2)],
-            'F': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 0), (3, 0), (4, 0), (2, 2), (3, 2)],
-            'G': [(4, 1), (3, 0), (2, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 4), (4, 3), (3, 3)],
-            'H': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 2), (3, 2), (4, 0), (4, 1), (4, 2), (4, 3),
-                  (4, 4), (4, 5)],
-            'I': [(1, 0), (2, 0), (3, 0), (4, 0), (3, 1), (2, 1), (2, 2), (3, 2), (3, 3), (2, 3), (2, 4), (3, 4),
-                  (3, 5), (2, 5), (1, 5), (4, 5)],
-            'J': [(1, 0), (2, 0), (3, 0), (4, 0), (2, 5), (3, 5), (4, 4), (4, 3), (4, 2), (4, 1), (1, 4), (2, 3)],
-            'K': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (4, 0), (3, 1), (2, 2), (3, 3), (4, 4), (4, 5)],
-            'L': [(1, 5), (1, 4), (1, 3), (1, 2), (1, 1), (1, 0), (2, 5), (3, 5), (4, 5), (2, 4), (2, 3), (2, 2),
-                  (2, 1), (2, 0)],
-            'M': [(0, 1), (0, 0), (0, 2), (0, 3), (0, 4), (0, 5), (1, 1), (2, 2), (3, 2), (4, 1), (5, 0), (5, 1),
-                  (5, 2), (5, 3), (5, 4), (5, 5)],
-            'N': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (5, 0), (5, 1), (5, 2), (5, 3), (5, 4), (5, 5),
-                  (4, 4), (3, 3), (2, 2), (1, 1)],
-            'O': [(1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (4, 3), (4, 4), (3, 5), (2, 5), (1, 4), (1, 3), (1, 2)],
-            'P': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 3), (3, 3), (4, 2), (4, 1), (3, 0), (2, 0)],
-            'Q': [(2, 0), (3, 0), (3, 4), (2, 4), (4, 5), (5, 5), (4, 1), (4, 2), (4, 3), (1, 3), (1, 2), (1, 1),
-                  (3, 5)],
-            'R': [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 3), (4, 2), (4, 1), (3, 0), (2, 0), (3, 3),
-                  (3, 4), (4, 5)],
-            'S': [(3, 0), (2, 0), (1, 1), (2, 5), (2, 2), (4, 0), (4, 3), (4, 4), (3, 2), (3, 5), (1, 5)],
-            'T': [(1, 0), (2, 0), (3, 0), (4, 0), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5), (2, 5), (2, 4), (2, 3),
-                  (2, 2), (2, 1)],
-            'U': [(1, 1), (1, 0), (1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 4), (4, 3), (4, 2), (4, 1), (4, 0)],
-            'V': [(0, 0), (0, 1), (0, 2), (0, 3), (1, 4), (2, 5), (3, 4), (4, 3), (4, 2), (4, 1), (4, 0)],
-            'W': [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 5), (2, 4), (3, 5), (2, 3), (4, 4), (4, 3), (4, 2),
-                  (4, 1), (4, 0)],
-            'X': [(1, 0), (1, 1), (1, 4), (1, 5), (3, 5), (3, 4), (3, 1), (3, 0), (2, 2), (2, 3)],
-            'Y': [(0, 0), (0, 1), (1, 2), (2, 4), (2, 5), (3, 2), (4, 1), (4, 0), (2, 3)],
-            'Z': [(1, 0), (2, 0), (3, 0), (4, 0), (4, 5), (3, 5), (2, 5), (1, 5), (1, 4), (2, 3), (3, 2), (4, 1)],
-            '1': [(1, 2), (2, 1), (3, 0), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5)],
-            '2': [(1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (2, 5), (3, 5), (4, 5), (1, 5), (2, 4), (3, 3)],
-            '3': [(1, 5), (2, 5), (3, 5), (4, 4), (4, 3), (3, 2), (2, 2), (4, 1), (3, 0), (2, 0), (1, 0)],
-            '4': [(1, 1), (1, 2), (1, 3), (2, 3), (3, 3), (4, 3), (4, 2), (4, 1), (4, 0), (4, 4), (4, 5), (1, 0)],
-            '5': [(4, 0), (3, 0), (1, 0), (2, 0), (1, 1), (1, 2), (2, 2), (3, 2), (4, 3), (4, 4), (3, 5), (2, 5),
-                  (1, 5)],
-            '6': [(3, 0), (1, 4), (2, 5), (3, 5), (4, 4), (1, 1), (2, 0), (4, 3), (2, 2), (3, 2), (1, 3), (4, 0)],
-            '7': [(1, 0), (2, 0), (3, 0), (4, 0), (4, 1), (3, 2), (2, 3), (2, 4), (2, 5)],
-            '8': [(2, 0), (3, 0), (1, 1), (2, 2), (3, 2), (4, 1), (4, 3), (4, 4), (3, 5), (2, 5), (1, 4), (1, 3)],
-            '9': [(1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (3, 3), (2, 3), (1, 2), (4, 4), (4, 3), (4, 5), (3, 5),
-                  (2, 5), (1, 5), (4, 0), (1, 0), (1, 3)],
-            '0': [(1, 1), (2, 0), (3, 0), (4, 1), (4, 2), (1, 2), (4, 4), (4, 3), (3, 5), (2, 5), (1, 5), (4, 0),
-                  (1, 0), (1, 3), (1, 4), (4, 5), (2, 3), (3, 2)],
-            '.': [(2, 5), (2, 4), (3, 4), (3, 5)],
-            ':': [(2, 5), (2, 4), (3, 4), (3, 5), (2, 1), (2, 2), (3, 2), (3, 1)],
-            '-': [(1, 3), (2, 3), (3, 3), (4, 3)],
-            '_': [(2, 5), (3, 5), (1, 5), (4, 5)],
-            '?': [(1, 1), (2, 0), (3, 0), (4, 1), (2, 3), (2, 5), (3, 2)],
-            '!': [(2, 0), (3, 0), (2, 3), (2, 5), (3, 2), (3, 5), (3, 3), (2, 2), (2, 1), (3, 1)],
-            ' ': []
-        }
-
-        return self.__characters_dict[char_input.upper()]
+    """ Access to the pixel graphics and characters. All tables are built once when the module is imported,
+    the lookups only return the prebuilt read-only tuples and allocate nothing.
+    """
+
+    @staticmethod
+    def pixelpics(icon):
+        return PIXELPICS[icon]
+
+    @staticmethod
+    def characters(char_input):
+        return CHARACTERS[char_input]
+
+    @staticmethod
+    def charactercolumns(char_input):
+        """Returns one bitmask per column of the given character, bit y is set if pixel (x, y) is on."""
+        return CHARACTER_COLUMNS[char_input]
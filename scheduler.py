@@ -0,0 +1,138 @@
+"""
+Class Scheduler used in PortaBrick Arcade project
+
+Copyright <2023> <LC-jrx>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from pybricks.tools import wait, StopWatch
+
+# Set to True to measure every task and print a summary when a game ends
+PROFILE_TASKS = False
+
+
+class Scheduler:
+    """ Cooperative scheduler for generator tasks, used for parallel computing without threads.
+        Every task declares its period in ms. A task is resumed with next() when its deadline is due, then its
+        deadline moves on by one period, so the tick rate does not drift with the time the tasks need. Between the
+        ticks the scheduler sleeps exactly until the next deadline is due.
+        Idea of generator tasks taken from: https://github.com/orgs/pybricks/discussions/356
+
+        With profiling switched on, the time of every next() is measured with a StopWatch and min/avg/max per task
+        are kept; print_summary() writes them to stdout. Switched off, a tick only checks one flag.
+
+        Input needed:
+        - profile (boolean): True measures every task, defaults to PROFILE_TASKS
+        - name (string): name of the loop, tells its ticks apart from those of other schedulers, e.g. "animation"
+
+        Readable from outside:
+        - name (string): name of the loop
+        - ticks (integer): number of loop passes so far
+        - overruns (integer): number of times a task was due later than one whole period
+    """
+
+    def __init__(self, profile=None, name="tick"):
+        self.name = name
+        self.__tasks = []       # generators of the tasks
+        self.__names = []       # names of the tasks for the summary
+        self.__periods = []     # period of each task in ms
+        self.__deadlines = []   # next due time of each task in ms
+        self.__overruns = []    # number of overruns of each task
+        self.__clock = StopWatch()  # one clock for all tasks
+        self.ticks = 0
+        self.overruns = 0
+
+        # Profiling, statistics per task: number of runs, total, min and max time in ms
+        self.__profile = PROFILE_TASKS if profile is None else profile
+        self.__runs = []
+        self.__total = []
+        self.__min = []
+        self.__max = []
+
+    def add(self, task, period, delay=0, name=None):
+        """ Adds a generator task.
+        :param task: generator, resumed once per period
+        :param period: period of the task in ms
+        :param delay: time in ms until the task is due the first time
+        :param name: name of the task in the profiling summary
+        :return:
+        """
+        self.__tasks.append(task)
+        self.__names.append(name if name is not None else "task " + str(len(self.__tasks)))
+        self.__periods.append(period)
+        self.__deadlines.append(self.__clock.time() + delay)
+        self.__overruns.append(0)
+        self.__runs.append(0)
+        self.__total.append(0)
+        self.__min.append(None)
+        self.__max.append(0)
+
+    def __resume_profiled(self, i):
+        """Resumes a task and adds the time it needed to its statistics."""
+        start = self.__clock.time()
+        next(self.__tasks[i])
+        duration = self.__clock.time() - start
+        self.__runs[i] += 1
+        self.__total[i] += duration
+        if self.__min[i] is None or duration < self.__min[i]:
+            self.__min[i] = duration
+        if duration > self.__max[i]:
+            self.__max[i] = duration
+
+    def tick(self):
+        """ Resumes all due tasks in the order they were added and sleeps until the next deadline.
+        :return:
+        """
+        now = self.__clock.time()
+        for i in range(len(self.__tasks)):
+            if now >= self.__deadlines[i]:
+                if self.__profile:
+                    self.__resume_profiled(i)
+                else:
+                    next(self.__tasks[i])
+                self.__deadlines[i] += self.__periods[i]
+                if self.__deadlines[i] <= now:
+                    # The task missed at least one whole period, restart its rhythm from now
+                    self.overruns += 1
+                    self.__overruns[i] += 1
+                    self.__deadlines[i] = now + self.__periods[i]
+        self.ticks += 1
+
+        # Sleep exactly until the next task is due
+        delay = min(self.__deadlines) - self.__clock.time()
+        if delay > 0:
+            wait(delay)
+
+    def run(self, stop):
+        """ Runs the tasks until the given condition is met.
+        :param stop: function without arguments, the loop ends as soon as it returns True
+        :return:
+        """
+        while not stop():
+            self.tick()
+
+    def print_summary(self):
+        """ Prints the statistics of all tasks, if profiling is switched on.
+        :return:
+        """
+        if not self.__profile:
+            return
+        print("Task profile after", self.ticks, "ticks (times in ms):")
+        print("task", "runs", "min", "avg", "max", "overruns", sep="\t")
+        for i in range(len(self.__tasks)):
+            average = self.__total[i] / self.__runs[i] if self.__runs[i] else 0
+            print(self.__names[i], self.__runs[i], self.__min[i], round(average, 2), self.__max[i],
+                  self.__overruns[i], sep="\t")